@@ -243,15 +243,14 @@ fetch('/stats').then(r=>r.json()).then(d=>{
         risk = getattr(_engine_ref, "risk_manager", None)
         if not risk:
             raise HTTPException(status_code=503, detail="risk_manager yok")
-        closed = [t for t in risk.trade_history if t.status == "closed"]
-        if len(closed) < 20:
+        returns = risk.closed_returns()
+        if len(returns) < 20:
             raise HTTPException(
                 status_code=400,
-                detail=f"Yeterli trade yok (gerekli≥20, mevcut={len(closed)})"
+                detail=f"Yeterli trade yok (gerekli≥20, mevcut={len(returns)})"
             )
         try:
             from utils.monte_carlo import run_monte_carlo
-            returns = [t.pnl_pct / 100 for t in closed]
             r = run_monte_carlo(returns, risk.current_capital, n_simulations, 50)
             return {
                 "median_max_drawdown": r.median_max_dd,
@@ -1,6 +1,7 @@
-import json
+from utils.signal_tracker import SignalTracker
 
-data = json.load(open("data/signals_history.json"))
-print(f"Total signals: {len(data)}")
+tracker = SignalTracker(read_only=True)  # yazıcı/migrasyon yok
+data = tracker.signals  # yalnız bellekteki (sıcak) kayıtlar; eskiler arşivde
+print(f"Total signals: {tracker.get_statistics()['total_signals']}")
 for s in data[-10:]:
-    print(f"  {s['signal_id']} | {s['signal_time_readable']} | {s['status']} | {s['direction']}")
+    print(f"  {s.signal_id} | {s.signal_time_readable} | {s.status} | {s.direction}")
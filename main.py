@@ -8,11 +8,12 @@ import signal
 import sys
 from datetime import datetime
 
+import numpy as np
 from strategies.multi_strategy import MultiStrategyEngine
 from strategies.base_strategy import SignalType
 from utils.data_fetcher import DataFetcher
 from utils.risk_manager import RiskManager
-from utils.position_manager import PositionManager
+from utils.position_manager import PositionManager, CloseResult
 from utils.indicators import TechnicalIndicators
 from utils.logger import setup_logger
 from utils.helpers import format_currency, format_pct
@@ -161,6 +162,7 @@ class TradingEngine:
         """Acik pozisyonlari surekli izle."""
         while self.is_running:
             try:
+                live = {}
                 for symbol in list(self.position_manager.open_positions.keys()):
                     ticker = await self.data_fetcher.fetch_ticker(symbol)
                     if not ticker:
@@ -169,18 +171,24 @@ class TradingEngine:
                     current_price = ticker.get("last", 0)
                     if current_price <= 0:
                         continue
-
-                    result = self.position_manager.check_exits(symbol, current_price)
-                    if result and "error" not in result:
-                        emoji = "WIN" if result["pnl"] > 0 else "LOSS"
+                    live[symbol] = current_price
+
+                # Fiyatlar slot sirasiyla hizalanir; fiyati olmayanlar NaN -> atlanir
+                prices = np.array([
+                    live.get(s, np.nan) for s in self.position_manager.position_symbols
+                ])
+                for result in self.position_manager.check_exits_batch(prices):
+                    symbol = result.symbol
+                    if isinstance(result, CloseResult):
+                        emoji = "WIN" if result.pnl > 0 else "LOSS"
                         message = (
                             f"{emoji} POZISYON KAPANDI\n"
                             f"Symbol: #{symbol.replace('/', '')}\n"
-                            f"Giris: {format_currency(result['entry_price'])}\n"
-                            f"Cikis: {format_currency(result['exit_price'])}\n"
-                            f"P&L: {format_currency(result['pnl'])} ({format_pct(result['pnl_pct'])})\n"
-                            f"Fee: {format_currency(result['fee'])}\n"
-                            f"Sebep: {result['reason']}\n"
+                            f"Giris: {format_currency(result.entry_price)}\n"
+                            f"Cikis: {format_currency(result.exit_price)}\n"
+                            f"P&L: {format_currency(result.pnl)} ({format_pct(result.pnl_pct)})\n"
+                            f"Fee: {format_currency(result.fee)}\n"
+                            f"Sebep: {result.reason}\n"
                             f"Sermaye: {format_currency(self.risk_manager.current_capital)}"
                         )
                         await self.notify(message)
@@ -195,7 +203,7 @@ class TradingEngine:
         while self.is_running:
             await asyncio.sleep(HEARTBEAT_INTERVAL)
             stats = self.risk_manager.get_stats()
-            open_pos = self.position_manager.get_open_positions()
+            open_count = len(self.position_manager.open_positions)
             uptime = datetime.now() - self.start_time
 
             message = (
@@ -205,7 +213,7 @@ class TradingEngine:
                 f"ROI: {format_pct(stats['roi'])}\n"
                 f"Trade: {stats['total_trades']} (Bugun: {stats['daily_trades']})\n"
                 f"Win Rate: {stats['win_rate']:.1f}%\n"
-                f"Acik Pozisyon: {len(open_pos)}\n"
+                f"Acik Pozisyon: {open_count}\n"
                 f"Tarama: #{self.scan_count}"
             )
             logger.info(message.replace('\n', ' | '))
@@ -130,12 +130,11 @@ class PaperTradingBot:
         risk = status["risk_stats"]
         positions = status["open_positions"]
 
-        pos_text = ""
-        for pos in positions:
-            pos_text += (
-                f"  📍 {pos['symbol']}: {format_currency(pos['entry_price'])} "
-                f"(SL: {format_currency(pos['stop_loss'])})\n"
-            )
+        pos_text = "".join(
+            f"  📍 {pos['symbol']}: {format_currency(pos['entry_price'])} "
+            f"(SL: {format_currency(pos['stop_loss'])})\n"
+            for pos in positions
+        )
         if not pos_text:
             pos_text = "  Açık pozisyon yok\n"
 
@@ -225,7 +224,7 @@ class PaperTradingBot:
         if not recent:
             text = "Henüz sinyal yok."
         else:
-            text = f"<b>📋 SON 10 SİNYAL</b>\n{'─' * 30}\n\n"
+            parts = [f"<b>📋 SON 10 SİNYAL</b>\n{'─' * 30}\n\n"]
             for s in reversed(recent):
                 status_emoji = {
                     "ACTIVE": "🟡",
@@ -238,12 +237,13 @@ class PaperTradingBot:
                 if s.status == "CLOSED":
                     pnl_text = f" | P&L: {format_currency(s.net_pnl)} ({format_pct(s.pnl_pct)})"
 
-                text += (
+                parts.append(
                     f"{status_emoji} <b>{s.symbol}</b> {s.direction}\n"
                     f"  🕐 {s.signal_time_readable}\n"
                     f"  💰 Fiyat: {format_currency(s.verified_price)} | Skor: {s.composite_score:.2f}\n"
                     f"  📊 Kalite: {s.data_quality} | Durum: {s.status}{pnl_text}\n\n"
                 )
+            text = "".join(parts)
 
         if update.callback_query:
             await update.callback_query.message.reply_text(text, parse_mode="HTML")
@@ -262,7 +262,7 @@ class PaperTradingBot:
         if not last_10:
             text = "Henüz kapanmış trade yok."
         else:
-            text = f"<b>🏆 SON 10 TRADE</b>\n{'─' * 30}\n\n"
+            parts = [f"<b>🏆 SON 10 TRADE</b>\n{'─' * 30}\n\n"]
             for t in reversed(last_10):
                 emoji = "✅" if t.result == "WIN" else "❌"
                 
@@ -276,13 +276,14 @@ class PaperTradingBot:
                     else:
                         duration = f"{mins}dk"
 
-                text += (
+                parts.append(
                     f"{emoji} <b>{t.symbol}</b> | {t.result}\n"
                     f"  Giriş: {format_currency(t.entry_price)} → Çıkış: {format_currency(t.exit_price)}\n"
                     f"  P&L: {format_currency(t.net_pnl)} ({format_pct(t.pnl_pct)})\n"
                     f"  Sebep: {t.exit_reason} | Süre: {duration}\n"
                     f"  🕐 {t.signal_time_readable}\n\n"
                 )
+            text = "".join(parts)
 
         if update.callback_query:
             await update.callback_query.message.reply_text(text, parse_mode="HTML")
@@ -300,7 +301,7 @@ class PaperTradingBot:
         if not positions:
             text = "📍 Açık pozisyon bulunmuyor."
         else:
-            text = f"<b>📍 AÇIK POZİSYONLAR</b> ({len(positions)})\n{'─' * 30}\n\n"
+            parts = [f"<b>📍 AÇIK POZİSYONLAR</b> ({len(positions)})\n{'─' * 30}\n\n"]
 
             for pos in positions:
                 # Anlık fiyat çek
@@ -320,7 +321,7 @@ class PaperTradingBot:
                     price_text = "  ⚠️ Fiyat alınamadı\n"
                     pnl_text = ""
 
-                text += (
+                parts.append(
                     f"📊 <b>{pos['symbol']}</b>\n"
                     f"  Giriş: {format_currency(pos['entry_price'])}\n"
                     f"{price_text}"
@@ -330,6 +331,7 @@ class PaperTradingBot:
                     f"  Trail: {format_currency(pos['trailing_stop'])}\n"
                     f"  Boyut: {format_currency(pos['quantity'] * pos['entry_price'])}\n\n"
                 )
+            text = "".join(parts)
 
         if update.callback_query:
             await update.callback_query.message.reply_text(text, parse_mode="HTML")
@@ -569,7 +571,7 @@ class PaperTradingBot:
             price = pos_manager.open_positions[symbol].entry_price
 
         result = pos_manager.close_position(symbol, price, reason="manual_telegram")
-        pnl = result.get("pnl", 0)
+        pnl = result.pnl if result else 0
         emoji = "✅" if pnl >= 0 else "❌"
         await update.message.reply_text(
             f"{emoji} <b>{symbol} pozisyon kapatıldı</b>\n"
@@ -622,17 +624,16 @@ class PaperTradingBot:
         try:
             from utils.monte_carlo import run_monte_carlo, format_mc_report
             risk = self.engine.risk_manager
-            closed_trades = [t for t in risk.trade_history if t.status == "closed"]
+            returns = risk.closed_returns()
 
-            if len(closed_trades) < 20:
+            if len(returns) < 20:
                 await update.message.reply_text(
                     f"⚠️ Monte Carlo için en az 20 kapalı trade gerekli "
-                    f"(şu an: {len(closed_trades)})",
+                    f"(şu an: {len(returns)})",
                     parse_mode="HTML",
                 )
                 return
 
-            returns = [t.pnl_pct / 100 for t in closed_trades]
             result = run_monte_carlo(
                 trade_returns=returns,
                 initial_capital=risk.current_capital,
@@ -7,9 +7,10 @@ GERÇEK veri, SANAL para.
 
 import asyncio
 from datetime import datetime, timezone
+import numpy as np
 from utils.data_fetcher import DataFetcher
 from utils.risk_manager import RiskManager, TradeRecord
-from utils.position_manager import PositionManager
+from utils.position_manager import PositionManager, PartialTPResult
 from utils.price_verifier import PriceVerifier
 from utils.signal_tracker import SignalTracker
 from utils.circuit_breaker import AdvancedCircuitBreaker
@@ -55,6 +56,7 @@ class PaperTradingEngine:
         self._signal_id_map: dict[str, str] = {}  # symbol → signal_id
         self.circuit_breaker = AdvancedCircuitBreaker()
         self._price_history: dict[str, list] = {}  # correlation için fiyat geçmişi
+        self._price_history_ts: dict = {}  # son barın zaman damgası (getiri önbelleği anahtarı)
         # Sinyal dedup: {symbol: (direction, composite_score, timestamp)}
         # Aynı pair için cooldown süresi içinde tekrar sinyal üretilmesini engeller.
         # Pozisyon açıkken de engeller (position_manager bunu zaten sağlar ama
@@ -115,6 +117,7 @@ class PaperTradingEngine:
             f"🕐 Başlangıç: {self.start_time.strftime('%d.%m.%Y %H:%M:%S UTC')}"
         )
 
+        flush_task = asyncio.create_task(self.signal_tracker.run_flush_loop())
         try:
             tasks = [
                 self._scan_loop(),
@@ -125,11 +128,13 @@ class PaperTradingEngine:
         except asyncio.CancelledError:
             logger.info("Paper trading durduruluyor...")
         finally:
+            flush_task.cancel()
             await self.stop()
 
     async def stop(self):
         """Motoru durdur ve özet gönder."""
         self.is_running = False
+        await self.signal_tracker.flush()
         stats = self.signal_tracker.get_statistics()
         
         await self.notify(
@@ -197,6 +202,12 @@ class PaperTradingEngine:
 
                 # Fiyat geçmişini güncelle (correlation için)
                 self._price_history[pair] = df["close"].tolist()
+                self._price_history_ts[pair] = df.index[-1]
+                # Son kapanmış barın getirisi → EWMA korelasyon önbelleği
+                closes = df["close"]
+                self.risk_manager.corr_cache.update(
+                    pair, closes.iloc[-2] / closes.iloc[-3] - 1, closes.index[-2]
+                )
 
                 # 2) 1h trend bağlamı çek
                 trend_ctx = await self.data_fetcher.fetch_trend_context(pair)
@@ -283,9 +294,10 @@ class PaperTradingEngine:
 
                 # 6) Sadece BUY sinyallerini işleme al (spot paper trading)
                 if direction != "BUY":
-                    signal.status = "REJECTED"
-                    signal.exit_reason = "Sadece BUY sinyalleri işleniyor (spot mode)"
-                    self.signal_tracker._save_history()
+                    self.signal_tracker.reject_signal(
+                        signal.signal_id,
+                        "Sadece BUY sinyalleri işleniyor (spot mode)"
+                    )
                     continue
 
                 # 7) Doğrulanmış fiyatla paper trade aç
@@ -296,7 +308,8 @@ class PaperTradingEngine:
                 open_symbols = list(self.position_manager.open_positions.keys())
                 if open_symbols:
                     can_open, max_corr = self.risk_manager.check_correlation(
-                        pair, open_symbols, self._price_history
+                        pair, open_symbols, self._price_history,
+                        self._price_history_ts,
                     )
                     if not can_open:
                         logger.debug(
@@ -368,89 +381,95 @@ class PaperTradingEngine:
         """Açık pozisyonları sürekli izle — çıkışta fiyat doğrula."""
         while self.is_running:
             try:
-                for symbol in list(self.position_manager.open_positions.keys()):
-                    # Gerçek fiyat çek
-                    verified = await self.price_verifier.verify_price(symbol)
-                    if not verified.verified or verified.price <= 0:
-                        continue
-
-                    current_price = verified.price
-
-                    # Pozisyon çıkış kontrolü
-                    result = self.position_manager.check_exits(symbol, current_price)
-                    if result and "error" not in result:
-                        # ── Parsiyel TP1 ─────────────────────────────────────
-                        if result.get("type") == "partial_tp1":
-                            pnl_partial = (result["price"] - self.position_manager.open_positions.get(symbol, type("", (), {"entry_price": result["price"]})()).entry_price) * result["closed_qty"] if symbol in self.position_manager.open_positions else 0
-                            await self.notify(
-                                f"✂️ <b>PARSİYEL TP1</b> — {symbol}\n"
-                                f"{'─' * 30}\n"
-                                f"  Kapatılan: {result['closed_qty']:.6f} lot\n"
-                                f"  Kalan: {result['remaining_qty']:.6f} lot\n"
-                                f"  Fiyat: {format_currency(result['price'])}\n"
-                                f"  Yeni SL (Breakeven): {format_currency(result['new_stop'])}"
-                            )
-                            continue  # Pozisyon hâlâ açık, izlemeye devam
-                        # ─────────────────────────────────────────────────────
-
-                        # Çıkış fiyatını da doğrula
-                        exit_verification = await self.price_verifier.verify_price(symbol)
-
-                        # Circuit breaker'a trade sonucunu kaydet
-                        self.circuit_breaker.record_trade_result(result.get("pnl_pct", 0.0) / 100)
-
-                        # Signal tracker güncelle
-                        signal = self.signal_tracker.close_signal(
-                            symbol=symbol,
-                            exit_price=current_price,
-                            exit_reason=result["reason"],
-                            pnl=result["pnl"],
-                            pnl_pct=result["pnl_pct"],
-                            fee=result["fee"],
-                            exit_verified_price=exit_verification.price if exit_verification.verified else 0,
-                            exit_data_quality="GOOD" if exit_verification.verified else "FAIL",
-                        )
-
-                        # Signal ID temizle
-                        self._signal_id_map.pop(symbol, None)
-
-                        # Telegram bildirimi
-                        is_win = result["pnl"] > 0
-                        emoji = "✅" if is_win else "❌"
-                        result_text = "WIN" if is_win else "LOSS"
-
-                        duration_text = ""
-                        if signal and signal.duration_seconds > 0:
-                            mins = signal.duration_seconds // 60
-                            secs = signal.duration_seconds % 60
-                            if mins > 60:
-                                hours = mins // 60
-                                mins = mins % 60
-                                duration_text = f"{hours}s {mins}dk {secs}sn"
-                            else:
-                                duration_text = f"{mins}dk {secs}sn"
-
+                # Gerçek fiyatları tek turda (eşzamanlı) çek
+                symbols = list(self.position_manager.open_positions.keys())
+                verified_prices = await self.price_verifier.verify_prices(symbols)
+                live = {
+                    symbol: verified.price
+                    for symbol, verified in zip(symbols, verified_prices)
+                    if verified.verified and verified.price > 0
+                }
+                # Fiyat dizisi await sonrası slot sırasıyla kurulur (arada açılan/kapanan
+                # pozisyonlar hizayı bozmaz); doğrulanmayanlar NaN → atlanır
+                prices = np.array([
+                    live.get(s, np.nan) for s in self.position_manager.position_symbols
+                ])
+
+                # Pozisyon çıkış kontrolü (tüm defter tek seferde)
+                for result in self.position_manager.check_exits_batch(prices):
+                    symbol = result.symbol
+                    current_price = live[symbol]
+                    # ── Parsiyel TP1 ─────────────────────────────────────
+                    if isinstance(result, PartialTPResult):
                         await self.notify(
-                            f"{emoji} <b>PAPER TRADE KAPANDI — {result_text}</b>\n"
+                            f"✂️ <b>PARSİYEL TP1</b> — {symbol}\n"
                             f"{'─' * 30}\n"
-                            f"📊 <b>{symbol}</b>\n"
-                            f"🕐 Kapanış: {datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M:%S UTC')}\n\n"
-                            f"💰 <b>İşlem Sonucu</b>\n"
-                            f"  Giriş: {format_currency(result['entry_price'])}\n"
-                            f"  Çıkış: {format_currency(result['exit_price'])}\n"
-                            f"  Doğrulanan Çıkış: {format_currency(exit_verification.price)}\n"
-                            f"  P&L: {format_currency(result['pnl'])} ({format_pct(result['pnl_pct'])})\n"
-                            f"  Fee: {format_currency(result['fee'])}\n"
-                            f"  Net P&L: {format_currency(result['pnl'] - result['fee'])}\n\n"
-                            f"📋 <b>Detaylar</b>\n"
-                            f"  Sebep: {result['reason']}\n"
-                            f"  Süre: {duration_text}\n"
-                            f"  Veri Kalitesi: {exit_verification.verified}\n\n"
-                            f"💼 <b>Portföy Durumu</b>\n"
-                            f"  Sermaye: {format_currency(self.risk_manager.current_capital)}\n"
-                            f"  ROI: {format_pct(((self.risk_manager.current_capital - self.initial_capital) / self.initial_capital) * 100)}\n"
-                            f"  Açık Poz: {len(self.position_manager.open_positions)}"
+                            f"  Kapatılan: {result.closed_qty:.6f} lot\n"
+                            f"  Kalan: {result.remaining_qty:.6f} lot\n"
+                            f"  Fiyat: {format_currency(result.price)}\n"
+                            f"  Yeni SL (Breakeven): {format_currency(result.new_stop)}"
                         )
+                        continue  # Pozisyon hâlâ açık, izlemeye devam
+                    # ─────────────────────────────────────────────────────
+
+                    # Çıkış fiyatını da doğrula
+                    exit_verification = await self.price_verifier.verify_price(symbol)
+
+                    # Circuit breaker'a trade sonucunu kaydet
+                    self.circuit_breaker.record_trade_result(result.pnl_pct / 100)
+
+                    # Signal tracker güncelle
+                    signal = self.signal_tracker.close_signal(
+                        symbol=symbol,
+                        exit_price=current_price,
+                        exit_reason=result.reason,
+                        pnl=result.pnl,
+                        pnl_pct=result.pnl_pct,
+                        fee=result.fee,
+                        exit_verified_price=exit_verification.price if exit_verification.verified else 0,
+                        exit_data_quality="GOOD" if exit_verification.verified else "FAIL",
+                    )
+
+                    # Signal ID temizle
+                    self._signal_id_map.pop(symbol, None)
+
+                    # Telegram bildirimi
+                    is_win = result.pnl > 0
+                    emoji = "✅" if is_win else "❌"
+                    result_text = "WIN" if is_win else "LOSS"
+
+                    duration_text = ""
+                    if signal and signal.duration_seconds > 0:
+                        mins = signal.duration_seconds // 60
+                        secs = signal.duration_seconds % 60
+                        if mins > 60:
+                            hours = mins // 60
+                            mins = mins % 60
+                            duration_text = f"{hours}s {mins}dk {secs}sn"
+                        else:
+                            duration_text = f"{mins}dk {secs}sn"
+
+                    await self.notify(
+                        f"{emoji} <b>PAPER TRADE KAPANDI — {result_text}</b>\n"
+                        f"{'─' * 30}\n"
+                        f"📊 <b>{symbol}</b>\n"
+                        f"🕐 Kapanış: {datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M:%S UTC')}\n\n"
+                        f"💰 <b>İşlem Sonucu</b>\n"
+                        f"  Giriş: {format_currency(result.entry_price)}\n"
+                        f"  Çıkış: {format_currency(result.exit_price)}\n"
+                        f"  Doğrulanan Çıkış: {format_currency(exit_verification.price)}\n"
+                        f"  P&L: {format_currency(result.pnl)} ({format_pct(result.pnl_pct)})\n"
+                        f"  Fee: {format_currency(result.fee)}\n"
+                        f"  Net P&L: {format_currency(result.pnl - result.fee)}\n\n"
+                        f"📋 <b>Detaylar</b>\n"
+                        f"  Sebep: {result.reason}\n"
+                        f"  Süre: {duration_text}\n"
+                        f"  Veri Kalitesi: {exit_verification.verified}\n\n"
+                        f"💼 <b>Portföy Durumu</b>\n"
+                        f"  Sermaye: {format_currency(self.risk_manager.current_capital)}\n"
+                        f"  ROI: {format_pct(((self.risk_manager.current_capital - self.initial_capital) / self.initial_capital) * 100)}\n"
+                        f"  Açık Poz: {len(self.position_manager.open_positions)}"
+                    )
 
                 await asyncio.sleep(2)  # 2 saniyede bir kontrol
             except Exception as e:
@@ -469,18 +488,20 @@ class PaperTradingEngine:
                 uptime = datetime.now(timezone.utc) - self.start_time
                 uptime_str = str(uptime).split('.')[0]
 
-                open_pos_text = ""
-                for sym, pos in self.position_manager.open_positions.items():
-                    vp = await self.price_verifier.verify_price(sym)
+                open_pos_parts = []
+                open_items = list(self.position_manager.open_positions.items())
+                vps = await self.price_verifier.verify_prices([sym for sym, _ in open_items])
+                for (sym, pos), vp in zip(open_items, vps):
                     if vp.verified:
                         unrealized_pnl = (vp.price - pos.entry_price) * pos.quantity
                         unrealized_pct = ((vp.price - pos.entry_price) / pos.entry_price) * 100
                         emoji = "🟢" if unrealized_pnl >= 0 else "🔴"
-                        open_pos_text += (
+                        open_pos_parts.append(
                             f"  {emoji} {sym}: {format_currency(vp.price)} "
                             f"({format_pct(unrealized_pct)})\n"
                         )
 
+                open_pos_text = "".join(open_pos_parts)
                 if not open_pos_text:
                     open_pos_text = "  Açık pozisyon yok\n"
 
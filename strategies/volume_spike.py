@@ -3,6 +3,7 @@ Volume Spike Stratejisi
 Anormal hacim artışlarında fiyat yönü ile birlikte sinyal üretir.
 """
 
+import numpy as np
 import pandas as pd
 from strategies.base_strategy import BaseStrategy, Signal, SignalType
 from config import VOLUME_SPIKE_MULTIPLIER, VOLUME_WEIGHT
@@ -19,9 +20,12 @@ class VolumeSpikeStrategy(BaseStrategy):
         if not all(c in df.columns for c in required) or len(df) < 25:
             return self._neutral_signal(symbol, df["close"].iloc[-1])
 
-        price = df["close"].iloc[-1]
-        prev_price = df["close"].iloc[-2]
-        volume_ratio = df["volume_ratio"].iloc[-1]
+        # Tek seferde ndarray: sonraki okumalar pandas .iloc yerine düz indeks
+        close = df["close"].to_numpy()
+        ratios = df["volume_ratio"].to_numpy()
+        price = close[-1]
+        prev_price = close[-2]
+        volume_ratio = ratios[-1]
         price_change = (price - prev_price) / prev_price
 
         # Hacim spike + fiyat artışı → Alım
@@ -52,10 +56,11 @@ class VolumeSpikeStrategy(BaseStrategy):
 
         # Kademeli hacim artışı (3 mum üst üste artan hacim)
         if len(df) >= 5:
-            recent_ratios = df["volume_ratio"].iloc[-3:]
-            if all(r > 1.3 for r in recent_ratios) and recent_ratios.is_monotonic_increasing:
-                recent_prices = df["close"].iloc[-3:]
-                if recent_prices.is_monotonic_increasing:
+            r1, r2, r3 = ratios[-3:]
+            # Zincir karşılaştırma = pandas is_monotonic_* (eşitlik serbest, NaN → False)
+            if r1 > 1.3 and r2 > 1.3 and r3 > 1.3 and r1 <= r2 <= r3:
+                p1, p2, p3 = close[-3:]
+                if p1 <= p2 <= p3:
                     return Signal(
                         signal_type=SignalType.BUY,
                         strength=0.65,
@@ -65,7 +70,7 @@ class VolumeSpikeStrategy(BaseStrategy):
                         reason="Kademeli hacim artışı + fiyat yükselişi",
                         metadata={"volume_ratio": volume_ratio},
                     )
-                elif recent_prices.is_monotonic_decreasing:
+                elif p1 >= p2 >= p3:
                     return Signal(
                         signal_type=SignalType.SELL,
                         strength=0.65,
@@ -78,7 +83,11 @@ class VolumeSpikeStrategy(BaseStrategy):
 
         # Volume dry-up sonrası spike (kontraksiyon → genişleme)
         if len(df) >= 10:
-            prev_5_avg = df["volume_ratio"].iloc[-6:-1].mean()
+            prev_5 = ratios[-6:-1]
+            prev_5_avg = prev_5.sum() / 5  # = prev_5.mean(); maske yalnızca NaN varsa
+            if np.isnan(prev_5_avg):
+                prev_5 = prev_5[~np.isnan(prev_5)]  # pandas mean gibi NaN atlanır
+                prev_5_avg = prev_5.mean() if prev_5.size else np.nan
             if prev_5_avg < 0.7 and volume_ratio > 1.5:
                 if price_change > 0:
                     return Signal(
@@ -110,11 +110,13 @@ class TradingTelegramBot:
             f"<b>Acik Pozisyonlar</b>: {len(positions)}\n"
         )
 
+        parts = [text]
         for pos in positions:
-            text += (
+            parts.append(
                 f"  {pos['symbol']} | {pos['side'].upper()} @ "
                 f"{format_currency(pos['entry_price'])}\n"
             )
+        text = "".join(parts)
 
         await update.message.reply_text(text, parse_mode="HTML")
 
@@ -150,15 +152,16 @@ class TradingTelegramBot:
             await update.message.reply_text("Henuz kapanmis trade yok.")
             return
 
-        text = "<b>Son Trade'ler</b>\n"
+        parts = ["<b>Son Trade'ler</b>\n"]
         for t in reversed(closed_trades):
             emoji = "WIN" if t.pnl > 0 else "LOSS"
-            text += (
+            parts.append(
                 f"\n{emoji} {t.symbol}\n"
                 f"  {t.side.upper()} @ {format_currency(t.entry_price)} -> "
                 f"{format_currency(t.exit_price)}\n"
                 f"  P&L: {format_currency(t.pnl)} ({format_pct(t.pnl_pct)})\n"
             )
+        text = "".join(parts)
 
         await update.message.reply_text(text, parse_mode="HTML")
 
@@ -19,6 +19,13 @@ ccxt_async_mock.ExchangeError = Exception
 sys.modules["ccxt"] = ccxt_mock
 sys.modules["ccxt.async_support"] = ccxt_async_mock
 
+import json
+import logging
+import math
+import tempfile
+import threading
+from contextlib import contextmanager
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -33,6 +40,12 @@ from strategies.multi_strategy import MultiStrategyEngine
 from strategies.base_strategy import SignalType
 from utils.indicators import TechnicalIndicators
 from utils.risk_manager import RiskManager
+from utils.position_manager import (
+    PositionManager, CloseResult, PartialTPResult, _PARALLEL_MIN_POSITIONS,
+)
+import utils.signal_tracker as signal_tracker_mod
+import utils.vpvr as vpvr_mod
+import utils.performance as performance_mod
 
 
 def generate_test_data(n: int = 200, trend: str = "up") -> pd.DataFrame:
@@ -199,6 +212,461 @@ def test_risk_manager():
     print("  PASSED")
 
 
+def open_book(specs: list, unlimited: bool = False) -> PositionManager:
+    """(sembol, yon) listesinden 100.0 girisli, ATR=1 pozisyon defteri."""
+    rm = RiskManager(100000.0)
+    if unlimited:
+        rm.can_trade = lambda: (True, "OK")  # MAX_CONCURRENT_POSITIONS siniri disi
+    pm = PositionManager(rm)
+    for symbol, side in specs:
+        assert pm.open_position(symbol, side, 100.0, 1.0) is not None, f"{symbol} acilamadi"
+    return pm
+
+
+def position_state(pm: PositionManager) -> dict:
+    return {
+        s: (p.highest_price, p.lowest_price, p.trailing_stop, p.stop_loss,
+            p.quantity, p.tp1_triggered)
+        for s, p in pm.open_positions.items()
+    }
+
+
+def run_exit_ticks(specs: list, ticks: list, unlimited: bool = False) -> list:
+    """Ayni defterde tek tek check_exits ile check_exits_batch'i karsilastir.
+
+    ticks: {sembol: fiyat}; eksik semboller o turda fiyatsiz (NaN) kalir.
+    Her tur icin toplu sonuclari (sembole gore sirali) dondurur.
+    """
+    logging.disable(logging.INFO)  # tur basina acilis/kapanis loglari
+    try:
+        return _run_exit_ticks(specs, ticks, unlimited)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run_exit_ticks(specs: list, ticks: list, unlimited: bool) -> list:
+    single = open_book(specs, unlimited)
+    batch = open_book(specs, unlimited)
+    by_symbol = lambda r: r.symbol
+    history = []
+    for tick in ticks:
+        expected = []
+        for symbol in list(single.open_positions):
+            if symbol in tick:
+                result = single.check_exits(symbol, tick[symbol])
+                if result:
+                    expected.append(result)
+        prices = np.array([tick.get(s, np.nan) for s in batch.position_symbols])
+        got = sorted(batch.check_exits_batch(prices), key=by_symbol)
+        assert got == sorted(expected, key=by_symbol), f"Sonuclar farkli: {got} != {expected}"
+        assert position_state(batch) == position_state(single), "Pozisyon durumu farkli"
+        assert set(batch.position_symbols) == set(batch.open_positions), "Slotlar bozuk"
+        history.append(got)
+    assert single.risk_manager.current_capital == batch.risk_manager.current_capital
+    return history
+
+
+def test_position_exits_batch():
+    """check_exits_batch, pozisyon pozisyon check_exits ile ayni sonucu vermeli."""
+    print("Testing: Position exits batch...")
+    specs = [("L1/USDT", "buy"), ("L2/USDT", "buy"), ("L3/USDT", "buy"),
+             ("S1/USDT", "sell"), ("S2/USDT", "sell")]
+    ticks = [
+        # L1 SL, L2 TP1 parsiyel, L3 ve S1 trailing kayar, S2 fiyatsiz
+        {"L1/USDT": 98.0, "L2/USDT": 102.5, "L3/USDT": 101.0, "S1/USDT": 100.0},
+        # L3/S1 hicbir sey tetiklemez, S2 (short) SL
+        {"L2/USDT": 102.0, "L3/USDT": 101.0, "S1/USDT": 100.0, "S2/USDT": 102.0},
+        # L2 breakeven sonrasi trailing cikis, L3 fiyatsiz
+        {"L2/USDT": 100.3, "S1/USDT": 100.0},
+    ]
+    history = run_exit_ticks(specs, ticks)
+    first, second, third = history
+    assert [(r.symbol, type(r)) for r in first] == [
+        ("L1/USDT", CloseResult), ("L2/USDT", PartialTPResult)], f"Tur 1: {first}"
+    assert first[0].reason == "stop_loss"
+    assert [(r.symbol, r.reason) for r in second] == [("S2/USDT", "stop_loss")], f"Tur 2: {second}"
+    assert [(r.symbol, r.reason) for r in third] == [("L2/USDT", "trailing_stop")], f"Tur 3: {third}"
+
+    # Buyuk defter: prange cekirdegi (numba varsa), rastgele yuruyus, eksik fiyatlar
+    n = _PARALLEL_MIN_POSITIONS + 36
+    rng = np.random.default_rng(11)
+    specs = [(f"P{i}/USDT", "buy" if i % 3 else "sell") for i in range(n)]
+    prices = np.full(n, 100.0)
+    ticks = []
+    for _ in range(150):
+        prices *= 1 + rng.normal(0, 0.006, n)
+        live = rng.random(n) >= 0.1
+        ticks.append({s: float(p) for (s, _), p, ok in zip(specs, prices, live) if ok})
+    history = run_exit_ticks(specs, ticks, unlimited=True)
+    assert sum(len(h) for h in history) > n // 2, "Cikislar tetiklenmedi"
+    print("  PASSED")
+
+
+def settle(tracker):
+    """Bekleyenleri yazdir ve yazici thread'in bitirmesini bekle."""
+    tracker._flush_if_dirty()
+    tracker._write_queue.join()
+
+
+@contextmanager
+def signal_files(**overrides):
+    """SignalTracker dosyalarini gecici dizine yonlendir; tracker fabrikasi verir.
+
+    Cikista acilan tracker'lar diske yazdirilir, sonra sabitler geri alinir
+    (atexit yazimi gercek data/ dosyalarina dusmez).
+    """
+    st = signal_tracker_mod
+    paths = ["SIGNALS_FILE", "LEGACY_SIGNALS_FILE", "STATS_FILE", "ARCHIVE_FILE"]
+    saved = {name: getattr(st, name) for name in paths + list(overrides)}
+    trackers = []
+
+    def open_tracker(**kwargs):
+        tracker = st.SignalTracker(**kwargs)
+        trackers.append(tracker)
+        return tracker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in paths:
+            setattr(st, name, os.path.join(tmp, os.path.basename(saved[name])))
+        for name, value in overrides.items():
+            setattr(st, name, value)
+        try:
+            yield open_tracker
+        finally:
+            for tracker in trackers:
+                settle(tracker)
+            for name, value in saved.items():
+                setattr(st, name, value)
+
+
+def new_signal(tracker, symbol: str, direction: str = "BUY", quality: str = "GOOD"):
+    """Fiyat dogrulamasiz test sinyali."""
+    return tracker.record_signal(
+        symbol, direction, {"composite_score": 0.6, "price": 100.0},
+        {"data_quality": quality},
+    )
+
+
+def full_signal_stats(records: list) -> dict:
+    """Kayitlarin durumundan bastan hesaplanan istatistikler (artimli sayaclarin referansi)."""
+    closed = [s for s in records if s.status == "CLOSED"]
+    wins = [s for s in closed if s.result == "WIN"]
+    losses = [s for s in closed if s.result == "LOSS"]
+    max_wins = max_losses = streak = 0
+    streak_type = None
+    for s in sorted(closed, key=lambda r: r.signal_time):
+        streak = streak + 1 if s.result == streak_type else 1
+        streak_type = s.result
+        if streak_type == "WIN":
+            max_wins = max(max_wins, streak)
+        elif streak_type == "LOSS":
+            max_losses = max(max_losses, streak)
+    return {
+        "total_signals": len(records),
+        "active": sum(s.status == "ACTIVE" for s in records),
+        "closed": len(closed),
+        "rejected": sum(s.status == "REJECTED" for s in records),
+        "pending": sum(s.status == "PENDING" for s in records),
+        "wins": len(wins),
+        "losses": len(losses),
+        "win_rate": len(wins) / len(closed) * 100 if closed else 0,
+        "total_pnl": sum(s.net_pnl for s in closed),
+        "total_fees": sum(s.fee for s in closed),
+        "avg_duration_seconds": (sum(s.duration_seconds for s in closed) / len(closed)
+                                 if closed else 0),
+        "max_consecutive_wins": max_wins,
+        "max_consecutive_losses": max_losses,
+        "buy_signals": sum(s.direction == "BUY" for s in records),
+        "sell_signals": sum(s.direction == "SELL" for s in records),
+    }
+
+
+def assert_stats_match(stats: dict, expected: dict):
+    for key, value in expected.items():
+        assert math.isclose(stats[key], value, rel_tol=1e-9, abs_tol=1e-9), \
+            f"{key}: {stats[key]} != {value}"
+
+
+def fill_signals(tracker, n: int, prefix: str = "S"):
+    """n sinyal: sirayla kazanan/kaybeden kapanis, red, acik ve bekleyen kayitlar."""
+    for i in range(n):
+        symbol = f"{prefix}{i}/USDT"
+        signal = new_signal(tracker, symbol, "BUY" if i % 4 else "SELL",
+                            "GOOD" if i % 3 else "WARNING")
+        kind = i % 5
+        if kind == 3:
+            tracker.reject_signal(signal.signal_id, "test")
+        elif kind != 4:
+            tracker.activate_signal(signal.signal_id, 100.0, 98.0, 104.0, 1.0, 100.0)
+            if kind != 2:
+                # Her kapanis farkli pnl_pct: en iyi/en kotu trade tek
+                pnl = (i + 1) * (1.0 if kind == 0 else -0.5)
+                tracker.close_signal(symbol, 100.0 + pnl, "test", pnl, pnl, 0.01 * i)
+
+
+def tracker_records(tracker) -> list:
+    """Arsivdeki ve bellekteki tum kayitlar."""
+    records = []
+    if os.path.exists(signal_tracker_mod.ARCHIVE_FILE):
+        with open(signal_tracker_mod.ARCHIVE_FILE) as f:
+            records = [signal_tracker_mod._record_from_dict(json.loads(line))
+                       for line in f if line.strip()]
+    return records + list(tracker.signals)
+
+
+def assert_tracker_consistent(tracker, records: list):
+    """Artimli istatistikler kayitlardan bastan hesaplananla ayni olmali."""
+    stats = tracker.get_statistics()
+    assert_stats_match(stats, full_signal_stats(records))
+    closed = [s for s in records if s.status == "CLOSED"]
+    if closed:
+        best = max(closed, key=lambda r: r.pnl_pct)
+        worst = min(closed, key=lambda r: r.pnl_pct)
+        assert stats["best_trade"]["signal_id"] == best.signal_id, "best_trade farkli"
+        assert stats["worst_trade"]["signal_id"] == worst.signal_id, "worst_trade farkli"
+
+
+def test_signal_tracker_reclose():
+    """Kapanmis sinyal yeniden aktiflesip kapaninca sayaclar cift saymamali."""
+    print("Testing: Signal Tracker re-close...")
+    with signal_files() as open_tracker:
+        tracker = open_tracker()
+        first = new_signal(tracker, "AAA/USDT")
+        new_signal(tracker, "BBB/USDT", "SELL")
+
+        tracker.activate_signal(first.signal_id, 100.0, 98.0, 104.0, 1.0, 100.0)
+        tracker.close_signal("AAA/USDT", 104.0, "take_profit", 4.0, 4.0, 0.1)
+        # Ayni signal_id tekrar (ornegin saniye icinde cift kayit) → ilk kayit yeniden acilir
+        tracker.activate_signal(first.signal_id, 100.0, 98.0, 104.0, 1.0, 100.0)
+        stats = tracker.get_statistics()
+        assert stats["closed"] == 0 and stats["wins"] == 0, "Yeniden acilan kayit sayilmamali"
+        tracker.close_signal("AAA/USDT", 97.0, "stop_loss", -3.0, -3.0, 0.1)
+        tracker.reject_signal(first.signal_id, "test")
+
+        stats = tracker.get_statistics()
+        assert_stats_match(stats, full_signal_stats(tracker.signals))
+        assert stats["today"]["closed"] == 0, "Reddedilen kayit bugunun kapananlarinda kalmamali"
+        assert stats["best_trade"] is None, "Kapali trade kalmadi"
+    print("  PASSED")
+
+
+def test_signal_tracker_read_only():
+    """read_only tracker eski formati okur ama diske yazmaz / migrasyon yapmaz."""
+    print("Testing: Signal Tracker read-only...")
+    with signal_files() as open_tracker:
+        writer = open_tracker()
+        for i in range(5):
+            new_signal(writer, f"R{i}/USDT")
+        legacy = [s.to_dict() for s in writer.signals]
+        expected = full_signal_stats(writer.signals)
+    with signal_files() as open_tracker:
+        with open(signal_tracker_mod.LEGACY_SIGNALS_FILE, "w") as f:
+            json.dump(legacy, f)
+        n_threads = threading.active_count()
+        tracker = open_tracker(read_only=True)
+        assert threading.active_count() == n_threads, "Yazici thread baslamamali"
+        assert_stats_match(tracker.get_statistics(), expected)
+        new_signal(tracker, "NEW/USDT")
+        assert not tracker._pending, "Salt okunur tracker olay tamponlamamali"
+        assert tracker.get_statistics()["total_signals"] == expected["total_signals"] + 1
+        tracker.compact()
+        settle(tracker)
+        assert not os.path.exists(signal_tracker_mod.SIGNALS_FILE), "Migrasyon/yazim olmamali"
+        assert not os.path.exists(signal_tracker_mod.STATS_FILE), "Istatistik yazilmamali"
+    print("  PASSED")
+
+
+def test_signal_tracker_archive():
+    """Kucuk MAX_IN_MEM ile arsive tasima; istatistikler ve yeniden yukleme tutarli."""
+    print("Testing: Signal Tracker archive...")
+    with signal_files(MAX_IN_MEM=20, ARCHIVE_BATCH=5) as open_tracker:
+        tracker = open_tracker()
+        for batch in range(4):
+            fill_signals(tracker, 15, prefix=f"A{batch}_")
+            settle(tracker)
+        # ACTIVE/PENDING asla tasinmaz: sicak kayitlar ust sinirin ustunde kalabilir
+        n_open = sum(s.status in ("ACTIVE", "PENDING") for s in tracker.signals)
+        assert len(tracker.signals) <= max(20, n_open), f"Bellekte {len(tracker.signals)} kayit"
+        assert os.path.exists(signal_tracker_mod.ARCHIVE_FILE), "Arsiv yazilmadi"
+        records = tracker_records(tracker)
+        assert len(records) == 60, f"Kayit kaybi: {len(records)}"
+        assert all(s.status in ("CLOSED", "REJECTED")
+                   for s in records[:len(records) - len(tracker.signals)]), \
+            "Acik/bekleyen kayit arsive tasinmamali"
+        assert_tracker_consistent(tracker, records)
+
+        reloaded = open_tracker()
+        assert len(reloaded.signals) == len(tracker.signals), "Bellek kayitlari farkli"
+        assert_tracker_consistent(reloaded, records)
+    print("  PASSED")
+
+
+def test_signal_tracker_compact_reload():
+    """Guncelleme olaylari sikistirilinca yeniden yukleme ayni durumu vermeli."""
+    print("Testing: Signal Tracker compact reload...")
+    with signal_files() as open_tracker:
+        tracker = open_tracker()
+        fill_signals(tracker, 25)
+        settle(tracker)
+        before = [s.to_dict() for s in tracker.signals]
+        tracker.compact()
+        settle(tracker)
+        with open(signal_tracker_mod.SIGNALS_FILE) as f:
+            lines = [line for line in f if line.strip()]
+        assert len(lines) == 25, f"Sikistirma sonrasi {len(lines)} satir"
+
+        reloaded = open_tracker()
+        assert [s.to_dict() for s in reloaded.signals] == before, "Kayitlar farkli"
+        assert set(reloaded.active_signals) == set(tracker.active_signals), "Aktifler farkli"
+        assert_tracker_consistent(reloaded, reloaded.signals)
+    print("  PASSED")
+
+
+def test_signal_tracker_legacy_migration():
+    """Eski .json dizisi yuklenip JSONL gunlugune tasinmali."""
+    print("Testing: Signal Tracker legacy migration...")
+    with signal_files() as open_tracker:
+        source = open_tracker()
+        fill_signals(source, 12)
+        legacy = [s.to_dict() for s in source.signals]
+    with signal_files() as open_tracker:
+        with open(signal_tracker_mod.LEGACY_SIGNALS_FILE, "w") as f:
+            json.dump(legacy, f)
+        tracker = open_tracker()
+        settle(tracker)
+        assert [s.to_dict() for s in tracker.signals] == legacy, "Kayitlar farkli"
+        assert_tracker_consistent(tracker, tracker.signals)
+        with open(signal_tracker_mod.SIGNALS_FILE) as f:
+            lines = [line for line in f if line.strip()]
+        assert len(lines) == len(legacy), "JSONL gunlugu yazilmadi"
+
+        reloaded = open_tracker()
+        assert [s.to_dict() for s in reloaded.signals] == legacy, "JSONL'den yukleme farkli"
+    print("  PASSED")
+
+
+def attribution_reference(trades: list) -> dict:
+    """Pencere trade'lerinden bastan hesaplanan attribution (artimli toplamlarin referansi)."""
+    groups = {axis: {} for axis in ("symbol", "strategy", "session", "regime")}
+    factors = {}
+    for t in trades:
+        is_win = t.outcome == performance_mod.OUTCOME_WIN
+        for axis, group in groups.items():
+            stats = group.setdefault(getattr(t, axis), {"count": 0, "pnl": 0.0, "wins": 0})
+            stats["count"] += 1
+            stats["pnl"] += t.pnl_pct
+            stats["wins"] += is_win
+        if is_win:
+            for factor, score in t.contributing_factors.items():
+                factors[factor] = factors.get(factor, 0.0) + score
+    ordered = sorted(trades, key=lambda t: t.pnl_pct)
+    return {
+        "total_pnl_pct": sum(t.pnl_pct for t in trades),
+        "groups": groups,
+        "factors": factors,
+        "best": ordered[-1].trade_id,
+        "worst": ordered[0].trade_id,
+    }
+
+
+def assert_report_matches(report, trades: list):
+    expected = attribution_reference(trades)
+    assert report.total_trades == len(trades), "Trade sayisi farkli"
+    assert math.isclose(report.total_pnl_pct, expected["total_pnl_pct"], abs_tol=1e-9), \
+        f"Toplam PnL: {report.total_pnl_pct} != {expected['total_pnl_pct']}"
+    for axis, group in expected["groups"].items():
+        got = getattr(report, f"by_{axis}")
+        assert set(got) == set(group), f"{axis} anahtarlari: {set(got)} != {set(group)}"
+        for key, stats in group.items():
+            assert got[key]["count"] == stats["count"] and got[key]["wins"] == stats["wins"], \
+                f"{axis}/{key} sayaclari farkli"
+            assert math.isclose(got[key]["pnl"], stats["pnl"], abs_tol=1e-9), f"{axis}/{key} PnL"
+    assert set(report.factor_contributions) == set(expected["factors"]), \
+        f"Faktorler: {report.factor_contributions} != {expected['factors']}"
+    for factor, value in expected["factors"].items():
+        assert math.isclose(report.factor_contributions[factor], value, abs_tol=1e-9), factor
+    assert report.best.trade_id == expected["best"], "best farkli"
+    assert report.worst.trade_id == expected["worst"], "worst farkli"
+
+
+def test_performance_window():
+    """MAX_TRADES penceresinden dusen trade'ler artimli rapordan dogru cikarilmali."""
+    print("Testing: Performance attribution window...")
+    saved = performance_mod.MAX_TRADES
+    performance_mod.MAX_TRADES = 8
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            attributor = performance_mod.PerformanceAttributor(os.path.join(tmp, "perf.json"))
+            symbols = ("AAA/USDT", "BBB/USDT", "CCC/USDT")
+            for i in range(30):
+                # 0: en iyi, 1: en kotu — pencereden dusunce yenileri bulunmali
+                pnl = {0: 9.0, 1: -9.0}.get(i, ((i * 7) % 11 - 5) * 0.37)
+                factors = {"fvg_fib": i % 4 + 1, "cvd": 2}
+                if i < 3:
+                    factors["early"] = 5  # yalniz ilk trade'lerde: pencereyle silinmeli
+                if i % 5 == 0:
+                    factors["flat"] = 0   # skoru 0 olan faktor de raporda kalmali
+                attributor.add_trade(
+                    trade_id=f"T{i}",
+                    symbol="OLD/USDT" if i < 2 else symbols[i % 3],
+                    side="buy",
+                    strategy=("rsi", "macd")[i % 2],
+                    session=("LONDON", "NEW_YORK", "ASIA")[i % 3],
+                    regime=("TRENDING", "RANGING")[i % 2],
+                    entry_time=f"2024-01-01T{i % 24:02d}:00:00",
+                    exit_time=f"2024-01-01T{i % 24:02d}:30:00",
+                    pnl_pct=pnl,
+                    pnl_usd=pnl * 10,
+                    contributing_factors=factors,
+                )
+                trades = list(attributor.trades)
+                assert len(trades) == min(i + 1, 8), "Pencere boyu yanlis"
+                assert_report_matches(attributor.generate_report(), trades)
+                for last_n in (1, 3, 5):
+                    if last_n < len(trades):
+                        assert_report_matches(attributor.generate_report(last_n), trades[-last_n:])
+            assert "OLD/USDT" not in attributor.generate_report().by_symbol
+    finally:
+        performance_mod.MAX_TRADES = saved
+    print("  PASSED")
+
+
+def test_vpvr_rolling():
+    """symbol= ile artimli VPVR, kayan pencerede sifirdan hesaplanan ile ayni olmali."""
+    print("Testing: VPVR rolling window...")
+    rng = np.random.default_rng(7)
+    n = 400
+    close = 100 + rng.uniform(-1, 1, n)
+    high = close + rng.uniform(0, 0.3, n)
+    low = close - rng.uniform(0, 0.3, n)
+    # Pencereden duserken araligin ucunu goturen mumlar
+    high[150] = 105.0
+    low[210] = 95.0
+    volume = rng.uniform(10, 1000, n)
+    df = pd.DataFrame({"high": high, "low": low, "close": close, "volume": volume},
+                      index=pd.date_range("2024-01-01", periods=n, freq="5min"))
+
+    symbol = "TEST/USDT"
+    vpvr_mod._rolling_state.pop(symbol, None)
+    incremental = 0
+    for end in range(120, n):
+        window = df.iloc[end - 120:end].copy()
+        if end % 3 == 0:
+            # Son (olusan) mumun yerinde guncellenmesi
+            window.iloc[-1, window.columns.get_loc("close")] += 0.05
+            window.iloc[-1, window.columns.get_loc("high")] += 0.05
+            window.iloc[-1, window.columns.get_loc("volume")] += 25.0
+        rolled = vpvr_mod.calculate_vpvr(window, symbol=symbol)
+        incremental += vpvr_mod._rolling_state[symbol][9] > 0
+        vpvr_mod._vpvr_cache.clear()
+        fresh = vpvr_mod.calculate_vpvr(window)
+        vpvr_mod._vpvr_cache.clear()
+        assert rolled == fresh, f"Pencere sonu {end}: artimli sonuc farkli"
+    assert incremental > 0, "Artimli yol hic kullanilmadi"
+    vpvr_mod._rolling_state.pop(symbol, None)
+    print("  PASSED")
+
+
 def run_all_tests():
     """Tum testleri calistir."""
     print("=" * 50)
@@ -213,6 +681,14 @@ def run_all_tests():
         test_ema_crossover,
         test_multi_strategy,
         test_risk_manager,
+        test_position_exits_batch,
+        test_signal_tracker_reclose,
+        test_signal_tracker_read_only,
+        test_signal_tracker_archive,
+        test_signal_tracker_compact_reload,
+        test_signal_tracker_legacy_migration,
+        test_vpvr_rolling,
+        test_performance_window,
     ]
 
     passed = 0
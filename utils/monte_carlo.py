@@ -43,7 +43,7 @@ class SimulationResult:
 
 
 def run_monte_carlo(
-    trade_returns: list[float],
+    trade_returns: list[float] | np.ndarray,
     initial_capital: float = 1000.0,
     n_simulations: int = 5000,
     n_trades: int = 100,
@@ -64,7 +64,7 @@ def run_monte_carlo(
     Returns:
         SimulationResult
     """
-    if not trade_returns or len(trade_returns) < 5:
+    if trade_returns is None or len(trade_returns) < 5:
         return _empty_simulation()
     
     try:
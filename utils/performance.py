@@ -12,17 +12,76 @@ Yanıtladığı sorular:
 
 import json
 import os
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date
-from collections import defaultdict
+from collections import deque
+import numpy as np
 from utils.logger import setup_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = setup_logger("Performance")
 
 PERFORMANCE_FILE = "data/performance_attribution.json"
+MAX_TRADES = 5000                 # Bellekte ve diskte tutulan son trade sayısı
+
+# Konsol rapor satır şablonları — sabit genişlikli alanlar, kutu içi 50 karakter
+_SYMBOL_ROW = "║  {:<12} {:+7.2f}% | WR:{:>3.0f}% | {:>3}T" + " " * 10 + "║"
+_STRATEGY_ROW = "║  {:<12.12} {:+7.2f}% | WR:{:>3.0f}%" + " " * 17 + "║"
+_SESSION_ROW = "║  {:<20.20} {:+7.2f}% | {:>3}T" + " " * 12 + "║"
+
+# Trade sonucu tamsayı olarak tutulur; dosyada ve raporda isimleri kullanılır
+OUTCOME_LOSS = 0
+OUTCOME_WIN = 1
+OUTCOME_BREAKEVEN = 2
+OUTCOME_NAMES = ("LOSS", "WIN", "BREAKEVEN")
+
+# Gruplama eksenleri (TradeAttribution alan adları)
+_GROUP_AXES = ("symbol", "strategy", "session", "regime")
+
 
+if NUMBA_AVAILABLE:
+    # Açık imza: çekirdek import sırasında derlenir (cache=True ile diskten yüklenir),
+    # ilk rapor çağrısı JIT derleme gecikmesi ödemez
+    @njit("Tuple((i8[:], f8[:], i8[:]))(i8[:], f8[:], i1[:], i8)", cache=True)
+    def _group_aggregate(gid, pnl, win, ngroups):
+        """Grup id'sine göre adet / PnL / kazanç toplamları (derlenmiş döngü)."""
+        counts = np.zeros(ngroups, np.int64)
+        pnls = np.zeros(ngroups, np.float64)
+        wins = np.zeros(ngroups, np.int64)
+        for i in range(pnl.size):
+            g = gid[i]
+            counts[g] += 1
+            pnls[g] += pnl[i]
+            wins[g] += win[i]
+        return counts, pnls, wins
+else:
+    def _group_aggregate(gid, pnl, win, ngroups):
+        """Grup id'sine göre adet / PnL / kazanç toplamları (NumPy bincount)."""
+        counts = np.bincount(gid, minlength=ngroups)
+        pnls = np.bincount(gid, weights=pnl, minlength=ngroups)
+        wins = np.bincount(gid, weights=win, minlength=ngroups).astype(np.int64)
+        return counts, pnls, wins
 
-@dataclass
+
+@dataclass(slots=True)
 class TradeAttribution:
     """Tek trade için attribution verisi."""
     trade_id: str
@@ -41,10 +100,37 @@ class TradeAttribution:
     score_at_entry: float
     
     # Sonuç
-    outcome: str                  # WIN / LOSS / BREAKEVEN
+    outcome: int                  # OUTCOME_WIN / OUTCOME_LOSS / OUTCOME_BREAKEVEN
+    
+    # Serileştirme önbelleği — trade kaydedildikten sonra değişmez
+    _cached_dict: dict | None = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Düşük kardinaliteli kategoriler intern edilir: tek kopya, hızlı dict anahtarı
+        self.symbol = sys.intern(self.symbol)
+        self.strategy = sys.intern(self.strategy)
+        self.session = sys.intern(self.session)
+        self.regime = sys.intern(self.regime)
+        self.contributing_factors = {
+            sys.intern(factor): score for factor, score in self.contributing_factors.items()
+        }
+        if isinstance(self.outcome, str):
+            self.outcome = OUTCOME_NAMES.index(self.outcome)
+    
+    def to_dict(self) -> dict:
+        """Kayıt formatındaki dict (asdict derin kopyası yerine bir kez kurulur)."""
+        d = self._cached_dict
+        if d is None:
+            d = {name: getattr(self, name) for name in _TRADE_FIELDS}
+            d["outcome"] = OUTCOME_NAMES[self.outcome]
+            self._cached_dict = d
+        return d
 
 
-@dataclass
+_TRADE_FIELDS = tuple(f.name for f in fields(TradeAttribution) if f.init)
+
+
+@dataclass(slots=True)
 class AttributionReport:
     """Bütünleşik attribution raporu."""
     period_start: str
@@ -67,14 +153,34 @@ class AttributionReport:
     # Factor contributions
     factor_contributions: dict = field(default_factory=dict)
     
-    # Best/worst
-    best_trade: dict = field(default_factory=dict)
-    worst_trade: dict = field(default_factory=dict)
+    # Best/worst — trade referansı tutulur, dict formu erişildiğinde üretilir
+    best: TradeAttribution | None = field(default=None, repr=False)
+    worst: TradeAttribution | None = field(default=None, repr=False)
     
     # Time analysis
     best_hour: int = -1
     worst_hour: int = -1
     best_day: str = ""
+    
+    @property
+    def best_trade(self) -> dict:
+        return dict(self.best.to_dict()) if self.best is not None else {}
+    
+    @property
+    def worst_trade(self) -> dict:
+        return dict(self.worst.to_dict()) if self.worst is not None else {}
+
+
+def _grow(arr: np.ndarray, n: int) -> np.ndarray:
+    """Kolon tamponunu son eksende iki katına çıkar (ilk n eleman korunur)."""
+    grown = np.empty(arr.shape[:-1] + (arr.shape[-1] * 2,), dtype=arr.dtype)
+    grown[..., :n] = arr[..., :n]
+    return grown
+
+
+def _group_dicts(groups: dict[str, list]) -> dict[str, dict]:
+    """[count, wins, pnl] listelerini rapor formatındaki dict'lere çevir."""
+    return {k: {"count": c, "pnl": p, "wins": w} for k, (c, w, p) in groups.items()}
 
 
 class PerformanceAttributor:
@@ -82,14 +188,211 @@ class PerformanceAttributor:
     
     def __init__(self, filepath: str = PERFORMANCE_FILE):
         self.filepath = filepath
-        self.trades: list[TradeAttribution] = []
+        self.trades: deque[TradeAttribution] = deque(maxlen=MAX_TRADES)
         self._load()
+        self._rebuild_aggregates()
     
     def record_trade(self, trade: TradeAttribution):
         """Yeni trade kaydı ekle."""
+        if len(self.trades) == self.trades.maxlen:
+            self._remove_from_aggregates(self.trades.popleft())
         self.trades.append(trade)
+        self._update_aggregates(trade)
+        if self._col_n - len(self.trades) >= self.trades.maxlen:
+            self._compact_columns()
         self._save()
     
+    def _rebuild_aggregates(self):
+        """Tüm trade'lerden kümülatif toplamları baştan kur."""
+        self._total_pnl = 0.0
+        # Grup değerleri [count, wins, pnl] listesi; rapor anında dict'e çevrilir
+        self._agg_by_symbol: dict[str, list] = {}
+        self._agg_by_strategy: dict[str, list] = {}
+        self._agg_by_session: dict[str, list] = {}
+        self._agg_by_regime: dict[str, list] = {}
+        self._factor_contrib: dict[str, float] = {}
+        self._factor_count: dict[str, int] = {}   # faktörü taşıyan kazanan trade sayısı
+        self._best: TradeAttribution | None = None
+        self._worst: TradeAttribution | None = None
+        
+        # Kolon bazlı kopya: kategoriler tamsayı id olarak, dilim raporları için
+        self._group_index: dict[str, dict[str, int]] = {axis: {} for axis in _GROUP_AXES}
+        self._group_names: dict[str, list[str]] = {axis: [] for axis in _GROUP_AXES}
+        capacity = max(64, len(self.trades))
+        self._pnl_arr = np.empty(capacity, dtype=np.float64)
+        self._win_arr = np.empty(capacity, dtype=np.int8)
+        self._gid_arr = np.empty((len(_GROUP_AXES), capacity), dtype=np.int64)
+        # Faktör matrisi: satır = faktör, sütun = trade (dilim toplamları tek matris-vektör çarpımı)
+        self._factor_index: dict[str, int] = {}
+        self._factor_names: list[str] = []
+        self._factor_arr = np.zeros((8, capacity), dtype=np.float64)
+        # Skoru 0 olan faktör de raporda yer alır: varlık ayrı tutulur
+        self._factor_has = np.zeros((8, capacity), dtype=np.bool_)
+        self._col_n = 0
+        for t in self.trades:
+            self._update_aggregates(t)
+    
+    def _update_aggregates(self, trade: TradeAttribution):
+        """Kümülatif toplamları tek trade ile O(1) güncelle."""
+        self._total_pnl += trade.pnl_pct
+        is_win = trade.outcome == OUTCOME_WIN
+        for group, key in (
+            (self._agg_by_symbol, trade.symbol),
+            (self._agg_by_strategy, trade.strategy),
+            (self._agg_by_session, trade.session),
+            (self._agg_by_regime, trade.regime),
+        ):
+            stats = group.get(key)
+            if stats is None:
+                stats = group[key] = [0, 0, 0.0]
+            stats[0] += 1
+            stats[1] += is_win
+            stats[2] += trade.pnl_pct
+        
+        if is_win:
+            factor_contrib = self._factor_contrib
+            factor_count = self._factor_count
+            for factor, score in trade.contributing_factors.items():
+                factor_contrib[factor] = factor_contrib.get(factor, 0.0) + score
+                factor_count[factor] = factor_count.get(factor, 0) + 1
+        
+        n = self._col_n
+        if n == self._pnl_arr.size:
+            self._pnl_arr = _grow(self._pnl_arr, n)
+            self._win_arr = _grow(self._win_arr, n)
+            self._gid_arr = _grow(self._gid_arr, n)
+            self._factor_arr = _grow(self._factor_arr, n)
+            self._factor_has = _grow(self._factor_has, n)
+        self._pnl_arr[n] = trade.pnl_pct
+        self._win_arr[n] = is_win
+        for row, axis in enumerate(_GROUP_AXES):
+            key = getattr(trade, axis)
+            index = self._group_index[axis]
+            gid = index.get(key)
+            if gid is None:
+                gid = index[key] = len(index)
+                self._group_names[axis].append(key)
+            self._gid_arr[row, n] = gid
+        self._factor_arr[:, n] = 0.0
+        self._factor_has[:, n] = False
+        for factor, score in trade.contributing_factors.items():
+            fi = self._factor_index.get(factor)
+            if fi is None:
+                fi = self._factor_index[factor] = len(self._factor_names)
+                self._factor_names.append(factor)
+                if fi == self._factor_arr.shape[0]:
+                    rows = np.zeros((fi * 2, self._factor_arr.shape[1]), dtype=np.float64)
+                    rows[:fi] = self._factor_arr
+                    self._factor_arr = rows
+                    has = np.zeros(rows.shape, dtype=np.bool_)
+                    has[:fi] = self._factor_has
+                    self._factor_has = has
+            self._factor_arr[fi, n] = score
+            self._factor_has[fi, n] = True
+        self._col_n = n + 1
+        
+        # Eşitlikte sıralı listedeki davranış korunur: en iyi = son, en kötü = ilk
+        if self._best is None or trade.pnl_pct >= self._best.pnl_pct:
+            self._best = trade
+        if self._worst is None or trade.pnl_pct < self._worst.pnl_pct:
+            self._worst = trade
+    
+    def _remove_from_aggregates(self, trade: TradeAttribution):
+        """Pencereden düşen trade'i kümülatif toplamlardan çıkar."""
+        self._total_pnl -= trade.pnl_pct
+        is_win = trade.outcome == OUTCOME_WIN
+        for group, key in (
+            (self._agg_by_symbol, trade.symbol),
+            (self._agg_by_strategy, trade.strategy),
+            (self._agg_by_session, trade.session),
+            (self._agg_by_regime, trade.regime),
+        ):
+            stats = group[key]
+            stats[0] -= 1
+            if stats[0] == 0:
+                del group[key]
+                continue
+            stats[1] -= is_win
+            stats[2] -= trade.pnl_pct
+        
+        if is_win:
+            factor_count = self._factor_count
+            for factor, score in trade.contributing_factors.items():
+                factor_count[factor] -= 1
+                if factor_count[factor] == 0:
+                    del factor_count[factor]
+                    del self._factor_contrib[factor]
+                else:
+                    self._factor_contrib[factor] -= score
+        
+        # Düşen trade en iyi/en kötü ise kalan pencerede PnL kolonundan yeniden bul
+        if trade is self._best or trade is self._worst:
+            offset = self._col_n - len(self.trades)
+            live = self._pnl_arr[offset:self._col_n]
+            if live.size == 0:
+                self._best = self._worst = None
+            else:
+                self._best = self.trades[live.size - 1 - int(live[::-1].argmax())]
+                self._worst = self.trades[int(live.argmin())]
+    
+    def _compact_columns(self):
+        """Pencere dışına düşmüş kolon öneklerini at (amortize O(1)).
+
+        Çıkarmalarla biriken float hatası sürmesin diye PnL ve faktör toplamları
+        burada kalan kolonlardan yeniden hesaplanır.
+        """
+        m = len(self.trades)
+        n = self._col_n
+        self._pnl_arr[:m] = self._pnl_arr[n - m:n]
+        self._win_arr[:m] = self._win_arr[n - m:n]
+        self._gid_arr[:, :m] = self._gid_arr[:, n - m:n]
+        self._factor_arr[:, :m] = self._factor_arr[:, n - m:n]
+        self._factor_has[:, :m] = self._factor_has[:, n - m:n]
+        self._col_n = m
+        
+        pnl = self._pnl_arr[:m]
+        win = self._win_arr[:m]
+        self._total_pnl = float(pnl.sum())
+        groups = (self._agg_by_symbol, self._agg_by_strategy,
+                  self._agg_by_session, self._agg_by_regime)
+        for row, (axis, group) in enumerate(zip(_GROUP_AXES, groups)):
+            index = self._group_index[axis]
+            _, pnls, _ = _group_aggregate(self._gid_arr[row, :m], pnl, win, len(index))
+            for key, stats in group.items():
+                stats[2] = float(pnls[index[key]])
+        nf = len(self._factor_names)
+        sums = self._factor_arr[:nf, :m] @ win.astype(np.float64)
+        factor_contrib = self._factor_contrib
+        for factor in factor_contrib:
+            factor_contrib[factor] = float(sums[self._factor_index[factor]])
+    
+    def _report_from_aggregates(self) -> AttributionReport:
+        """Kümülatif toplamlardan O(k) rapor üret (k = farklı anahtar sayısı)."""
+        if not self.trades:
+            return AttributionReport(
+                period_start="", period_end="",
+                total_trades=0, total_pnl_pct=0.0
+            )
+        
+        by_symbol = _group_dicts(self._agg_by_symbol)
+        by_strategy = _group_dicts(self._agg_by_strategy)
+        for stats in (*by_symbol.values(), *by_strategy.values()):
+            stats["win_rate"] = stats["wins"] / stats["count"] * 100 if stats["count"] > 0 else 0
+        
+        return AttributionReport(
+            period_start=self.trades[0].entry_time,
+            period_end=self.trades[-1].exit_time,
+            total_trades=len(self.trades),
+            total_pnl_pct=self._total_pnl,
+            by_symbol=by_symbol,
+            by_strategy=by_strategy,
+            by_session=_group_dicts(self._agg_by_session),
+            by_regime=_group_dicts(self._agg_by_regime),
+            factor_contributions=dict(self._factor_contrib),
+            best=self._best,
+            worst=self._worst,
+        )
+    
     def add_trade(
         self,
         trade_id: str,
@@ -111,11 +414,11 @@ class PerformanceAttributor:
             contributing_factors = {}
         
         if pnl_pct > 0.005:
-            outcome = "WIN"
+            outcome = OUTCOME_WIN
         elif pnl_pct < -0.005:
-            outcome = "LOSS"
+            outcome = OUTCOME_LOSS
         else:
-            outcome = "BREAKEVEN"
+            outcome = OUTCOME_BREAKEVEN
         
         trade = TradeAttribution(
             trade_id=trade_id,
@@ -134,90 +437,67 @@ class PerformanceAttributor:
             outcome=outcome,
         )
         self.record_trade(trade)
-        logger.debug(f"Trade kaydedildi: {trade_id} | {outcome} | {pnl_pct:+.2%}")
+        logger.debug(f"Trade kaydedildi: {trade_id} | {OUTCOME_NAMES[outcome]} | {pnl_pct:+.2%}")
     
     def generate_report(self, last_n_trades: int = None) -> AttributionReport:
         """Attribution raporu üret."""
-        trades = self.trades
-        if last_n_trades:
-            trades = trades[-last_n_trades:]
+        if not last_n_trades or not 0 < last_n_trades < len(self.trades):
+            return self._report_from_aggregates()
         
-        if not trades:
-            return AttributionReport(
-                period_start="", period_end="",
-                total_trades=0, total_pnl_pct=0.0
-            )
+        # Son N trade için dilim üzerinde yeniden hesapla
+        start = len(self.trades) - last_n_trades      # self.trades içindeki başlangıç
+        col_start = self._col_n - last_n_trades       # kolonlar içindeki başlangıç
         
-        total_pnl = sum(t.pnl_pct for t in trades)
+        # PnL, kazanç maskesi ve kategori id'leri bir kez alınır (kopyasız view),
+        # dört gruplamada ve faktör toplamında ortak kullanılır
+        pnl = self._pnl_arr[col_start:self._col_n]
+        win = self._win_arr[col_start:self._col_n]
+        gids = self._gid_arr[:, col_start:self._col_n]
+        total_pnl = float(pnl.sum())
         
-        # By symbol
-        by_symbol: dict[str, dict] = defaultdict(lambda: {"count": 0, "pnl": 0.0, "wins": 0})
-        for t in trades:
-            by_symbol[t.symbol]["count"] += 1
-            by_symbol[t.symbol]["pnl"] += t.pnl_pct
-            if t.outcome == "WIN":
-                by_symbol[t.symbol]["wins"] += 1
+        # By symbol / strategy / session / regime
+        by_symbol, by_strategy, by_session, by_regime = (
+            self._group_stats(axis, gids[row], pnl, win) for row, axis in enumerate(_GROUP_AXES)
+        )
         
         # Win rate ekle
-        for sym, stats in by_symbol.items():
+        for stats in (*by_symbol.values(), *by_strategy.values()):
             stats["win_rate"] = stats["wins"] / stats["count"] * 100 if stats["count"] > 0 else 0
         
-        # By strategy
-        by_strategy: dict[str, dict] = defaultdict(lambda: {"count": 0, "pnl": 0.0, "wins": 0})
-        for t in trades:
-            by_strategy[t.strategy]["count"] += 1
-            by_strategy[t.strategy]["pnl"] += t.pnl_pct
-            if t.outcome == "WIN":
-                by_strategy[t.strategy]["wins"] += 1
-        
-        for strat, stats in by_strategy.items():
-            stats["win_rate"] = stats["wins"] / stats["count"] * 100 if stats["count"] > 0 else 0
+        # Factor contributions — kazanan trade'lerin faktör skorları: matris @ kazanç maskesi
+        nf = len(self._factor_names)
+        win_f = win.astype(np.float64)
+        sums = self._factor_arr[:nf, col_start:self._col_n] @ win_f
+        present = self._factor_has[:nf, col_start:self._col_n] @ win_f
+        factor_contrib = {self._factor_names[i]: float(sums[i]) for i in np.flatnonzero(present)}
         
-        # By session
-        by_session: dict[str, dict] = defaultdict(lambda: {"count": 0, "pnl": 0.0, "wins": 0})
-        for t in trades:
-            by_session[t.session]["count"] += 1
-            by_session[t.session]["pnl"] += t.pnl_pct
-            if t.outcome == "WIN":
-                by_session[t.session]["wins"] += 1
-        
-        # By regime
-        by_regime: dict[str, dict] = defaultdict(lambda: {"count": 0, "pnl": 0.0, "wins": 0})
-        for t in trades:
-            by_regime[t.regime]["count"] += 1
-            by_regime[t.regime]["pnl"] += t.pnl_pct
-            if t.outcome == "WIN":
-                by_regime[t.regime]["wins"] += 1
-        
-        # Factor contributions
-        factor_contrib: dict[str, float] = defaultdict(float)
-        for t in trades:
-            if t.outcome == "WIN":
-                for factor, score in t.contributing_factors.items():
-                    factor_contrib[factor] += score
-        
-        # Best / worst trades
-        sorted_trades = sorted(trades, key=lambda t: t.pnl_pct)
-        best = asdict(sorted_trades[-1]) if sorted_trades else {}
-        worst = asdict(sorted_trades[0]) if sorted_trades else {}
-        
-        period_start = trades[0].entry_time if trades else ""
-        period_end = trades[-1].exit_time if trades else ""
+        # Best / worst trades — PnL kolonunda argmax/argmin (eşitlikte en iyi = son, en kötü = ilk)
+        best = self.trades[start + len(pnl) - 1 - int(pnl[::-1].argmax())]
+        worst = self.trades[start + int(pnl.argmin())]
         
         return AttributionReport(
-            period_start=period_start,
-            period_end=period_end,
-            total_trades=len(trades),
+            period_start=self.trades[start].entry_time,
+            period_end=self.trades[-1].exit_time,
+            total_trades=last_n_trades,
             total_pnl_pct=total_pnl,
-            by_symbol=dict(by_symbol),
-            by_strategy=dict(by_strategy),
-            by_session=dict(by_session),
-            by_regime=dict(by_regime),
-            factor_contributions=dict(factor_contrib),
-            best_trade=best,
-            worst_trade=worst,
+            by_symbol=by_symbol,
+            by_strategy=by_strategy,
+            by_session=by_session,
+            by_regime=by_regime,
+            factor_contributions=factor_contrib,
+            best=best,
+            worst=worst,
         )
     
+    def _group_stats(self, axis: str, gid: np.ndarray, pnl: np.ndarray, win: np.ndarray) -> dict:
+        """Bir eksen için dilimdeki grup istatistiklerini hesapla."""
+        names = self._group_names[axis]
+        counts, pnls, wins = _group_aggregate(gid, pnl, win, len(names))
+        return {
+            names[g]: {"count": int(counts[g]), "pnl": float(pnls[g]), "wins": int(wins[g])}
+            for g in np.flatnonzero(counts)
+        }
+    
     def format_report_console(self, report: AttributionReport) -> str:
         """ASCII formatında rapor döndür."""
         lines = [
@@ -231,11 +511,7 @@ class PerformanceAttributor:
         lines.append("║  📌 SEMBOL BAZLI PERFORMANS                       ║")
         sorted_symbols = sorted(report.by_symbol.items(), key=lambda x: x[1]["pnl"], reverse=True)
         for sym, stats in sorted_symbols[:5]:
-            bar = "+" if stats["pnl"] >= 0 else ""
-            lines.append(
-                f"║  {sym:<12} {bar}{stats['pnl']:.2f}% | WR:{stats['win_rate']:.0f}% | {stats['count']}T  "
-                + " " * max(0, 50 - len(f"  {sym:<12} {bar}{stats['pnl']:.2f}% | WR:{stats['win_rate']:.0f}% | {stats['count']}T  ")) + "║"
-            )
+            lines.append(_SYMBOL_ROW.format(sym, stats["pnl"], stats["win_rate"], stats["count"]))
         
         lines.append("╠══════════════════════════════════════════════════╣")
         
@@ -243,16 +519,14 @@ class PerformanceAttributor:
         lines.append("║  🎯 STRATEJİ BAZLI PERFORMANS                     ║")
         sorted_strats = sorted(report.by_strategy.items(), key=lambda x: x[1]["pnl"], reverse=True)
         for strat, stats in sorted_strats[:5]:
-            bar = "+" if stats["pnl"] >= 0 else ""
-            lines.append(f"║  {strat[:12]:<12} {bar}{stats['pnl']:.2f}% | WR:{stats['win_rate']:.0f}%         ║")
+            lines.append(_STRATEGY_ROW.format(strat, stats["pnl"], stats["win_rate"]))
         
         lines.append("╠══════════════════════════════════════════════════╣")
         
         # By Session
         lines.append("║  🕐 SESSION BAZLI PERFORMANS                      ║")
         for session, stats in sorted(report.by_session.items(), key=lambda x: x[1]["pnl"], reverse=True):
-            bar = "+" if stats["pnl"] >= 0 else ""
-            lines.append(f"║  {session[:20]:<20} {bar}{stats['pnl']:.2f}% | {stats['count']}T      ║")
+            lines.append(_SESSION_ROW.format(session, stats["pnl"], stats["count"]))
         
         lines.append("╚══════════════════════════════════════════════════╝")
         return "\n".join(lines)
@@ -261,21 +535,40 @@ class PerformanceAttributor:
         """Kayıtlı attribution verilerini yükle."""
         try:
             if os.path.exists(self.filepath):
-                with open(self.filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.trades = [TradeAttribution(**t) for t in data.get("trades", [])]
+                if IJSON_AVAILABLE:
+                    # Akışlı okuma: tüm dict ağacı bellekte kurulmadan trade'ler tek tek oluşturulur
+                    with open(self.filepath, "rb") as f:
+                        self.trades = deque(
+                            (TradeAttribution(**t) for t in ijson.items(f, "trades.item", use_float=True)),
+                            maxlen=MAX_TRADES,
+                        )
+                else:
+                    if ORJSON_AVAILABLE:
+                        with open(self.filepath, "rb") as f:
+                            data = orjson.loads(f.read())
+                    else:
+                        with open(self.filepath, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                    self.trades = deque(
+                        (TradeAttribution(**t) for t in data.get("trades", [])), maxlen=MAX_TRADES
+                    )
+                    del data
                 logger.debug(f"Attribution: {len(self.trades)} trade yüklendi")
         except Exception as e:
             logger.warning(f"Attribution yükleme hatası: {e}")
-            self.trades = []
+            self.trades = deque(maxlen=MAX_TRADES)
     
     def _save(self):
         """Attribution verilerini kaydet."""
         try:
             os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-            data = {"trades": [asdict(t) for t in self.trades[-5000:]]}  # Son 5000 trade
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            data = {"trades": [t.to_dict() for t in self.trades]}  # Son MAX_TRADES trade
+            if ORJSON_AVAILABLE:
+                with open(self.filepath, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(self.filepath, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
             logger.error(f"Attribution kayıt hatası: {e}")
 
@@ -3,19 +3,158 @@ Pozisyon Yönetimi Modülü
 Açık pozisyonları takip eder, stop-loss/take-profit yönetimi yapar.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Callable, Iterator, NamedTuple
+import numpy as np
 from utils.logger import setup_logger
 from utils.risk_manager import RiskManager, TradeRecord
 from config import (
     PARTIAL_TP_ENABLED, PARTIAL_TP1_RATIO, PARTIAL_TP1_MULTIPLIER,
     BREAKEVEN_AFTER_TP1, PYRAMID_ENABLED, KELLY_SIZING_ENABLED,
+    STOP_LOSS_PCT, TRAILING_STOP_PCT,
 )
 
-logger = setup_logger("PositionManager")
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
+logger = setup_logger("PositionManager")
 
-@dataclass
+# SoA (structure-of-arrays) sütunları — açık pozisyonların sayısal alanları
+_SOA_FLOAT = ("entry", "sl", "tp", "ts", "hi", "lo", "tp1")
+_SOA_INITIAL_CAP = 8
+
+# Çekirdek çıkış kodları
+EXIT_NONE = 0
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+EXIT_TRAILING_STOP = 3
+EXIT_PARTIAL_TP1 = 4
+_EXIT_REASONS = (None, "stop_loss", "take_profit", "trailing_stop")
+_BATCH_UPDATED = -1               # Toplu kontrol: çıkış yok ama hi/lo/trailing değişti
+_PARALLEL_MIN_POSITIONS = 64      # Bunun altında thread başlatma maliyeti kazancı aşar
+
+
+def _check_exits_kernel(side_sign, entry, sl, tp, ts, hi, lo, price, qty,
+                        tp1_level, tp1_ratio, tp1_active, be_after_tp1,
+                        trail_pct, stop_pct):
+    """Tick başına çıkış mantığı — yalnızca float/int/bool, Python nesnesi yok.
+
+    Dönüş: (highest, lowest, trailing_stop, çıkış kodu, TP1'de kapanacak miktar)
+    """
+    if price > hi:
+        hi = price
+    if price < lo:
+        lo = price
+
+    # Trailing stop — RiskManager.calculate_trailing_stop ile aynı formül
+    if side_sign > 0:
+        trail = max(hi * (1 - trail_pct), entry * (1 - stop_pct))
+        if trail > ts:
+            ts = trail
+    else:
+        trail = min(price * (1 + trail_pct), entry * (1 + stop_pct))
+        if trail < ts:
+            ts = trail
+
+    if tp1_active and side_sign * (price - tp1_level) >= 0:
+        if be_after_tp1:
+            ts = entry
+        return hi, lo, ts, EXIT_PARTIAL_TP1, qty * tp1_ratio
+
+    code = EXIT_NONE
+    if side_sign * (price - sl) <= 0:
+        code = EXIT_STOP_LOSS
+    elif side_sign * (price - tp) >= 0:
+        code = EXIT_TAKE_PROFIT
+    elif side_sign * (price - ts) <= 0 and side_sign * (price - entry) > 0:
+        code = EXIT_TRAILING_STOP
+    return hi, lo, ts, code, 0.0
+
+
+if NUMBA_AVAILABLE:
+    # Açık imza: import sırasında derlenir, ilk tick JIT gecikmesi ödemez
+    _check_exits_kernel = njit(
+        "Tuple((f8, f8, f8, i8, f8))"
+        "(i1, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, b1, b1, f8, f8)",
+        cache=True,
+    )(_check_exits_kernel)
+
+
+def _check_exits_batch_numpy(side, entry, sl, tp, ts, hi, lo, tp1, tp1_done,
+                             prices, trail_pct, stop_pct, tp1_enabled, out):
+    """Toplu çıkış kontrolü (NumPy maskeleri); hi/lo/ts yerinde güncellenir.
+
+    out: çıkış kodu, _BATCH_UPDATED veya EXIT_NONE. <=0/NaN fiyatlar atlanır.
+    """
+    valid = prices > 0
+
+    # Highest/lowest güncelle
+    up = valid & (prices > hi)
+    down = valid & (prices < lo)
+    hi[up] = prices[up]
+    lo[down] = prices[down]
+
+    # Trailing stop — RiskManager.calculate_trailing_stop ile aynı formül
+    buy = side > 0
+    with np.errstate(invalid="ignore"):
+        trail = np.where(
+            buy,
+            np.maximum(hi * (1 - trail_pct), entry * (1 - stop_pct)),
+            np.minimum(prices * (1 + trail_pct), entry * (1 + stop_pct)),
+        )
+        moved = valid & np.where(buy, trail > ts, trail < ts)
+    ts[moved] = trail[moved]
+
+    # Çıkış koşulları: side=+1 (buy) / -1 (sell) ile tek ifade
+    with np.errstate(invalid="ignore"):
+        hit = (side * (prices - sl) <= 0) | (side * (prices - tp) >= 0)
+        hit |= (side * (prices - ts) <= 0) & (side * (prices - entry) > 0)
+        if tp1_enabled:
+            hit |= ~tp1_done & (side * (prices - tp1) >= 0)
+    hit &= valid
+
+    out[:] = EXIT_NONE
+    out[up | down | moved] = _BATCH_UPDATED
+    # Kesin neden check_exits'te belirlenir; burada yalnızca tetiklenme işareti
+    out[hit] = EXIT_STOP_LOSS
+
+
+if NUMBA_AVAILABLE:
+    @njit(
+        "void(i1[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], b1[:], "
+        "f8[:], f8, f8, b1, i8[:])",
+        parallel=True, cache=True,
+    )
+    def _check_exits_batch_parallel(side, entry, sl, tp, ts, hi, lo, tp1, tp1_done,
+                                    prices, trail_pct, stop_pct, tp1_enabled, out):
+        """Toplu çıkış kontrolü — pozisyonlar prange ile thread'lere bölünür."""
+        for i in prange(prices.size):
+            price = prices[i]
+            if not price > 0:
+                out[i] = EXIT_NONE
+                continue
+            new_hi, new_lo, new_ts, code, _ = _check_exits_kernel(
+                side[i], entry[i], sl[i], tp[i], ts[i], hi[i], lo[i], price, 0.0,
+                tp1[i], 0.0, tp1_enabled and not tp1_done[i], False,
+                trail_pct, stop_pct,
+            )
+            if code != EXIT_NONE:
+                out[i] = code
+            elif new_hi != hi[i] or new_lo != lo[i] or new_ts != ts[i]:
+                out[i] = _BATCH_UPDATED
+            else:
+                out[i] = EXIT_NONE
+            hi[i] = new_hi
+            lo[i] = new_lo
+            ts[i] = new_ts
+
+
+@dataclass(slots=True)
 class Position:
     """Açık pozisyon."""
     symbol: str
@@ -35,38 +174,146 @@ class Position:
     # Pyramid scaling
     scale_ins: int = 0
     avg_entry_price: float = 0.0
+    # Yön işareti: +1 buy, -1 sell — çıkış ve P&L matematiği dallanmadan
+    side_sign: int = field(init=False, default=1)
+
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == "buy" else -1
+
+
+class CloseResult(NamedTuple):
+    """close_position sonucu."""
+    symbol: str
+    side: str
+    entry_price: float
+    exit_price: float
+    quantity: float
+    pnl: float
+    pnl_pct: float
+    fee: float
+    reason: str
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class PartialTPResult(NamedTuple):
+    """Parsiyel TP1 sonucu — pozisyon açık kalır."""
+    symbol: str
+    closed_qty: float
+    remaining_qty: float
+    price: float
+    new_stop: float
+
+    def to_dict(self) -> dict:
+        return {"type": "partial_tp1", **self._asdict()}
+
+
+class ScaleInResult(NamedTuple):
+    """Piramit scale-in sonucu."""
+    symbol: str
+    added_qty: float
+    new_total_qty: float
+    new_avg_entry: float
+    scale_in_num: int
+
+    def to_dict(self) -> dict:
+        return {"type": "scale_in", **self._asdict()}
+
+
+ExitResult = CloseResult | PartialTPResult
 
 
 class PositionManager:
     """Pozisyon yöneticisi."""
 
-    def __init__(self, risk_manager: RiskManager):
+    def __init__(self, risk_manager: RiskManager,
+                 clock: Callable[[], datetime] = datetime.now):
         self.risk_manager = risk_manager
+        # Zaman kaynağı: backtest/replay'de simülasyon saati verilebilir
+        self._clock = clock
         self.open_positions: dict[str, Position] = {}
+        # Toplu çıkış kontrolü için paralel diziler; slot sırası _symbols ile aynı
+        self._symbols: list[str] = []
+        self._slot: dict[str, int] = {}
+        self._arr = {k: np.empty(_SOA_INITIAL_CAP) for k in _SOA_FLOAT}
+        self._arr["side"] = np.empty(_SOA_INITIAL_CAP, dtype=np.int8)
+        self._arr["tp1_done"] = np.zeros(_SOA_INITIAL_CAP, dtype=np.bool_)
+
+    # ==================== SoA DİZİLERİ ====================
+
+    @property
+    def position_symbols(self) -> tuple[str, ...]:
+        """check_exits_batch fiyat dizisinin hizalanacağı sembol sırası."""
+        return tuple(self._symbols)
+
+    def _soa_write(self, i: int, pos: Position):
+        """Pozisyonun sayısal alanlarını i. slota yaz."""
+        a = self._arr
+        a["entry"][i] = pos.entry_price
+        a["sl"][i] = pos.stop_loss
+        a["tp"][i] = pos.take_profit
+        a["ts"][i] = pos.trailing_stop
+        a["hi"][i] = pos.highest_price
+        a["lo"][i] = pos.lowest_price
+        a["tp1"][i] = pos.tp1_price
+        a["side"][i] = pos.side_sign
+        a["tp1_done"][i] = pos.tp1_triggered
+
+    def _soa_add(self, pos: Position):
+        """Pozisyonu dizilerin sonuna ekle (kapasite dolarsa ikiye katla)."""
+        n = len(self._symbols)
+        a = self._arr
+        if n == a["entry"].size:
+            for k, arr in a.items():
+                a[k] = np.concatenate((arr, np.zeros_like(arr)))
+        self._slot[pos.symbol] = n
+        self._symbols.append(pos.symbol)
+        self._soa_write(n, pos)
+
+    def _soa_remove(self, symbol: str):
+        """Slotu swap-pop ile boşalt: son slot silinenin yerine taşınır (O(1))."""
+        i = self._slot.pop(symbol, None)
+        if i is None:
+            return
+        last = len(self._symbols) - 1
+        last_symbol = self._symbols.pop()
+        if i != last:
+            for arr in self._arr.values():
+                arr[i] = arr[last]
+            self._symbols[i] = last_symbol
+            self._slot[last_symbol] = i
 
     def open_position(self, symbol: str, side: str, entry_price: float,
                       atr: float) -> Position | None:
-        """Yeni pozisyon aç."""
-        can_trade, reason = self.risk_manager.can_trade()
+        """Yeni pozisyon aç.
+
+        Sembol intern edilir; open_positions anahtarları ile sonraki
+        aramalar kimlik karşılaştırmasıyla eşleşir. Çağıranlar mümkünse
+        zaten intern edilmiş sembol geçmeli.
+        """
+        symbol = sys.intern(symbol)
+        rm = self.risk_manager
+        can_trade, reason = rm.can_trade()
         if not can_trade:
-            logger.warning(f"Trade reddedildi ({symbol}): {reason}")
+            logger.warning("Trade reddedildi (%s): %s", symbol, reason)
             return None
 
         if symbol in self.open_positions:
-            logger.warning(f"Zaten açık pozisyon var: {symbol}")
+            logger.warning("Zaten açık pozisyon var: %s", symbol)
             return None
 
-        stop_loss = self.risk_manager.calculate_stop_loss(entry_price, atr, side)
-        take_profit = self.risk_manager.calculate_take_profit(entry_price, stop_loss, side)
+        stop_loss = rm.calculate_stop_loss(entry_price, atr, side)
+        take_profit = rm.calculate_take_profit(entry_price, stop_loss, side)
 
         # Kelly Criterion pozisyon boyutlama (yeterli geçmiş yoksa standarda düşer)
         if KELLY_SIZING_ENABLED:
-            quantity = self.risk_manager.get_kelly_size_from_history(entry_price, stop_loss)
+            quantity = rm.get_kelly_size_from_history(entry_price, stop_loss)
         else:
-            quantity = self.risk_manager.calculate_position_size(entry_price, stop_loss)
+            quantity = rm.calculate_position_size(entry_price, stop_loss)
 
         if quantity <= 0:
-            logger.warning(f"Geçersiz pozisyon boyutu: {symbol}")
+            logger.warning("Geçersiz pozisyon boyutu: %s", symbol)
             return None
 
         position = Position(
@@ -79,8 +326,15 @@ class PositionManager:
             trailing_stop=stop_loss,
             highest_price=entry_price,
             lowest_price=entry_price,
+            entry_time=self._clock(),
+        )
+        # TP1 seviyesi giriş ve ilk SL'den türer; tick başına yeniden hesaplanmaz
+        position.tp1_price = (
+            entry_price
+            + position.side_sign * abs(entry_price - stop_loss) * PARTIAL_TP1_MULTIPLIER
         )
         self.open_positions[symbol] = position
+        self._soa_add(position)
 
         # Trade kaydı oluştur
         trade = TradeRecord(
@@ -92,118 +346,111 @@ class PositionManager:
             take_profit=take_profit,
             status="open",
         )
-        self.risk_manager.record_trade(trade)
+        rm.record_trade(trade)
 
         logger.info(
-            f"Pozisyon açıldı: {side.upper()} {symbol} @ {entry_price:.6f} | "
-            f"Miktar: {quantity:.6f} | SL: {stop_loss:.6f} | TP: {take_profit:.6f}"
+            "Pozisyon açıldı: %s %s @ %.6f | Miktar: %.6f | SL: %.6f | TP: %.6f",
+            side.upper(), symbol, entry_price, quantity, stop_loss, take_profit,
         )
         return position
 
-    def check_exits(self, symbol: str, current_price: float) -> dict | None:
+    def check_exits(self, symbol: str, current_price: float) -> ExitResult | None:
         """Pozisyon çıkış koşullarını kontrol et."""
-        if symbol not in self.open_positions:
+        symbol = sys.intern(symbol)
+        pos = self.open_positions.get(symbol)
+        if pos is None:
             return None
 
-        pos = self.open_positions[symbol]
+        result = self._evaluate_exit(symbol, pos, current_price)
+
+        # Pozisyon hâlâ açıksa güncellenen alanları dizilere yansıt
+        i = self._slot.get(symbol)
+        if i is not None:
+            self._soa_write(i, pos)
+        return result
 
-        # Highest/lowest güncelle
-        if current_price > pos.highest_price:
-            pos.highest_price = current_price
-        if current_price < pos.lowest_price:
-            pos.lowest_price = current_price
+    def check_exits_batch(self, prices: np.ndarray) -> list[ExitResult]:
+        """Tüm açık pozisyonların çıkış koşullarını tek seferde (vektörel) kontrol et.
 
-        # Trailing stop güncelle
-        new_trailing = self.risk_manager.calculate_trailing_stop(
-            current_price, pos.entry_price, pos.highest_price, pos.side
+        prices: position_symbols sırasıyla hizalı güncel fiyatlar; <=0 veya NaN
+        olan slotlar atlanır. Highest/lowest/trailing güncellemeleri dizilerde
+        yapılır (büyük defterlerde numba prange ile paralel); yalnızca
+        SL/TP/trailing/TP1 tetiklenen pozisyonlar check_exits yoluna düşer.
+        Dönüş: tetiklenen pozisyonların sonuçları.
+        """
+        n = len(self._symbols)
+        if n == 0:
+            return []
+
+        a = self._arr
+        price = np.ascontiguousarray(prices, dtype=np.float64)[:n]
+        out = np.empty(n, dtype=np.int64)
+        kernel = (_check_exits_batch_parallel
+                  if NUMBA_AVAILABLE and n >= _PARALLEL_MIN_POSITIONS
+                  else _check_exits_batch_numpy)
+        kernel(
+            a["side"][:n], a["entry"][:n], a["sl"][:n], a["tp"][:n], a["ts"][:n],
+            a["hi"][:n], a["lo"][:n], a["tp1"][:n], a["tp1_done"][:n], price,
+            TRAILING_STOP_PCT, STOP_LOSS_PCT, PARTIAL_TP_ENABLED, out,
+        )
+
+        # Tetiklenmeyen ama alanı değişen pozisyonları nesnelere geri yaz
+        positions = self.open_positions
+        hi, lo, ts = a["hi"], a["lo"], a["ts"]
+        for i in np.flatnonzero(out == _BATCH_UPDATED):
+            pos = positions[self._symbols[i]]
+            pos.highest_price = float(hi[i])
+            pos.lowest_price = float(lo[i])
+            pos.trailing_stop = float(ts[i])
+
+        # Tetiklenenler tam yoldan geçer (kapatma slot sırasını değiştirir)
+        idx = np.flatnonzero(out > 0)
+        triggered = [(self._symbols[i], float(price[i])) for i in idx]
+        results = []
+        for symbol, current_price in triggered:
+            result = self.check_exits(symbol, current_price)
+            if result:
+                results.append(result)
+        return results
+
+    def _evaluate_exit(self, symbol: str, pos: Position,
+                       current_price: float) -> ExitResult | None:
+        """Tek pozisyon için highest/trailing/TP1/SL/TP mantığı (sayısal kısım çekirdekte)."""
+        hi, lo, ts, code, close_qty = _check_exits_kernel(
+            pos.side_sign, pos.entry_price, pos.stop_loss, pos.take_profit,
+            pos.trailing_stop, pos.highest_price, pos.lowest_price,
+            current_price, pos.quantity, pos.tp1_price, PARTIAL_TP1_RATIO,
+            PARTIAL_TP_ENABLED and not pos.tp1_triggered, BREAKEVEN_AFTER_TP1, TRAILING_STOP_PCT, STOP_LOSS_PCT,
         )
-        if pos.side == "buy" and new_trailing > pos.trailing_stop:
-            pos.trailing_stop = new_trailing
-        elif pos.side == "sell" and new_trailing < pos.trailing_stop:
-            pos.trailing_stop = new_trailing
-
-        # ── PARSİYEL TP1 KONTROLÜ ─────────────────────────────────
-        if PARTIAL_TP_ENABLED and not pos.tp1_triggered:
-            risk = abs(pos.entry_price - pos.stop_loss)
-            if pos.side == "buy":
-                tp1_level = pos.entry_price + risk * PARTIAL_TP1_MULTIPLIER
-                pos.tp1_price = tp1_level
-                if current_price >= tp1_level:
-                    # Pozisyonun %50'sini kapat
-                    close_qty = pos.quantity * PARTIAL_TP1_RATIO
-                    pos.quantity -= close_qty
-                    pos.tp1_triggered = True
-                    pos.tp1_quantity = close_qty
-
-                    # Stop → Breakeven
-                    if BREAKEVEN_AFTER_TP1:
-                        pos.stop_loss = pos.entry_price
-                        pos.trailing_stop = pos.entry_price
-                        logger.info(
-                            f"✂️ Parsiyel TP1: {symbol} {close_qty:.6f} lot @ {current_price:.4f} | "
-                            f"SL → Breakeven ({pos.entry_price:.4f})"
-                        )
-                    else:
-                        logger.info(f"✂️ Parsiyel TP1: {symbol} {close_qty:.6f} lot @ {current_price:.4f}")
-
-                    return {
-                        "type": "partial_tp1",
-                        "symbol": symbol,
-                        "closed_qty": close_qty,
-                        "remaining_qty": pos.quantity,
-                        "price": current_price,
-                        "new_stop": pos.stop_loss,
-                    }
-            else:  # sell
-                tp1_level = pos.entry_price - risk * PARTIAL_TP1_MULTIPLIER
-                pos.tp1_price = tp1_level
-                if current_price <= tp1_level:
-                    close_qty = pos.quantity * PARTIAL_TP1_RATIO
-                    pos.quantity -= close_qty
-                    pos.tp1_triggered = True
-                    pos.tp1_quantity = close_qty
-
-                    if BREAKEVEN_AFTER_TP1:
-                        pos.stop_loss = pos.entry_price
-                        pos.trailing_stop = pos.entry_price
-                        logger.info(
-                            f"✂️ Parsiyel TP1: {symbol} {close_qty:.6f} lot @ {current_price:.4f} | "
-                            f"SL → Breakeven ({pos.entry_price:.4f})"
-                        )
-
-                    return {
-                        "type": "partial_tp1",
-                        "symbol": symbol,
-                        "closed_qty": close_qty,
-                        "remaining_qty": pos.quantity,
-                        "price": current_price,
-                        "new_stop": pos.stop_loss,
-                    }
+        pos.highest_price = hi
+        pos.lowest_price = lo
+        pos.trailing_stop = ts
+
+        # ── PARSİYEL TP1 ──────────────────────────────────────────
+        if code == EXIT_PARTIAL_TP1:
+            pos.quantity -= close_qty
+            pos.tp1_triggered = True
+            pos.tp1_quantity = close_qty
+
+            # Stop → Breakeven (trailing çekirdekte girişe çekildi)
+            if BREAKEVEN_AFTER_TP1:
+                pos.stop_loss = pos.entry_price
+                logger.info(
+                    "✂️ Parsiyel TP1: %s %.6f lot @ %.4f | SL → Breakeven (%.4f)",
+                    symbol, close_qty, current_price, pos.entry_price,
+                )
+            else:
+                logger.info("✂️ Parsiyel TP1: %s %.6f lot @ %.4f", symbol, close_qty, current_price)
+
+            return PartialTPResult(symbol, close_qty, pos.quantity, current_price, pos.stop_loss)
         # ──────────────────────────────────────────────────────────
 
-        exit_reason = None
-
-        if pos.side == "buy":
-            if current_price <= pos.stop_loss:
-                exit_reason = "stop_loss"
-            elif current_price >= pos.take_profit:
-                exit_reason = "take_profit"
-            elif current_price <= pos.trailing_stop and current_price > pos.entry_price:
-                exit_reason = "trailing_stop"
-        else:  # sell (short)
-            if current_price >= pos.stop_loss:
-                exit_reason = "stop_loss"
-            elif current_price <= pos.take_profit:
-                exit_reason = "take_profit"
-            elif current_price >= pos.trailing_stop and current_price < pos.entry_price:
-                exit_reason = "trailing_stop"
-
-        if exit_reason:
-            return self.close_position(symbol, current_price, exit_reason)
+        if code != EXIT_NONE:
+            return self.close_position(symbol, current_price, _EXIT_REASONS[code])
         return None
 
     def scale_in(self, symbol: str, current_price: float, atr: float,
-                 add_quantity: float = None) -> dict | None:
+                 add_quantity: float = None) -> ScaleInResult | None:
         """Piramit: Kazanan pozisyona ek giriş yap (scale-in).
 
         Args:
@@ -215,23 +462,21 @@ class PositionManager:
         Returns:
             Scale-in bilgisi veya None
         """
+        symbol = sys.intern(symbol)
         if not PYRAMID_ENABLED:
             return None
 
-        if symbol not in self.open_positions:
+        pos = self.open_positions.get(symbol)
+        if pos is None:
             return None
 
-        pos = self.open_positions[symbol]
-
         # Max 3 scale-in
         if pos.scale_ins >= 3:
-            logger.debug(f"Max scale-in limitine ulaşıldı: {symbol}")
+            logger.debug("Max scale-in limitine ulaşıldı: %s", symbol)
             return None
 
         # Sadece karda olan pozisyona scale-in
-        if pos.side == "buy" and current_price <= pos.entry_price:
-            return None
-        if pos.side == "sell" and current_price >= pos.entry_price:
+        if pos.side_sign * (current_price - pos.entry_price) <= 0:
             return None
 
         # Eklenecek miktar
@@ -252,39 +497,30 @@ class PositionManager:
         pos.scale_ins += 1
 
         logger.info(
-            f"📈 Scale-in #{pos.scale_ins}: {symbol} +{add_quantity:.6f} @ {current_price:.4f} | "
-            f"Yeni ortalama: {new_avg:.4f} | Toplam: {pos.quantity:.6f}"
+            "📈 Scale-in #%d: %s +%.6f @ %.4f | Yeni ortalama: %.4f | Toplam: %.6f",
+            pos.scale_ins, symbol, add_quantity, current_price, new_avg, pos.quantity,
         )
 
-        return {
-            "type": "scale_in",
-            "symbol": symbol,
-            "added_qty": add_quantity,
-            "new_total_qty": pos.quantity,
-            "new_avg_entry": new_avg,
-            "scale_in_num": pos.scale_ins,
-        }
+        return ScaleInResult(symbol, add_quantity, pos.quantity, new_avg, pos.scale_ins)
 
     def close_position(self, symbol: str, exit_price: float,
-                       reason: str = "manual") -> dict:
-        """Pozisyonu kapat."""
-        if symbol not in self.open_positions:
-            return {"error": f"Pozisyon bulunamadı: {symbol}"}
-
-        pos = self.open_positions.pop(symbol)
+                       reason: str = "manual") -> CloseResult | None:
+        """Pozisyonu kapat (açık pozisyon yoksa None)."""
+        symbol = sys.intern(symbol)
+        pos = self.open_positions.pop(symbol, None)
+        if pos is None:
+            logger.warning("Pozisyon bulunamadı: %s", symbol)
+            return None
+        self._soa_remove(symbol)
+        rm = self.risk_manager
 
-        # P&L hesapla
-        if pos.side == "buy":
-            pnl = (exit_price - pos.entry_price) * pos.quantity
-            pnl_pct = ((exit_price - pos.entry_price) / pos.entry_price) * 100
-        else:
-            pnl = (pos.entry_price - exit_price) * pos.quantity
-            pnl_pct = ((pos.entry_price - exit_price) / pos.entry_price) * 100
+        # P&L hesapla (side_sign ile yön dallanmasız)
+        delta = pos.side_sign * (exit_price - pos.entry_price)
+        pnl = delta * pos.quantity
+        pnl_pct = delta / pos.entry_price * 100
 
-        # Fee hesapla
-        entry_fee = self.risk_manager.calculate_fees(pos.quantity, pos.entry_price)
-        exit_fee = self.risk_manager.calculate_fees(pos.quantity, exit_price)
-        total_fee = entry_fee + exit_fee
+        # Fee hesapla (giriş + çıkış)
+        total_fee = rm.calculate_round_trip_fees(pos.quantity, pos.entry_price, exit_price)
 
         net_pnl = pnl - total_fee
 
@@ -299,36 +535,27 @@ class PositionManager:
             pnl_pct=pnl_pct,
             fee=total_fee,
             entry_time=pos.entry_time,
-            exit_time=datetime.now(),
+            exit_time=self._clock(),
             status="closed",
             stop_loss=pos.stop_loss,
             take_profit=pos.take_profit,
         )
-        self.risk_manager.record_trade(trade)
+        rm.record_trade(trade)
 
-        emoji = "✅" if net_pnl > 0 else "❌"
         logger.info(
-            f"{emoji} Pozisyon kapatıldı ({reason}): {symbol} | "
-            f"P&L: ${net_pnl:.2f} ({pnl_pct:.2f}%) | Fee: ${total_fee:.4f}"
+            "%s Pozisyon kapatıldı (%s): %s | P&L: $%.2f (%.2f%%) | Fee: $%.4f",
+            "✅" if net_pnl > 0 else "❌", reason, symbol, net_pnl, pnl_pct, total_fee,
         )
 
-        return {
-            "symbol": symbol,
-            "side": pos.side,
-            "entry_price": pos.entry_price,
-            "exit_price": exit_price,
-            "quantity": pos.quantity,
-            "pnl": net_pnl,
-            "pnl_pct": pnl_pct,
-            "fee": total_fee,
-            "reason": reason,
-        }
+        return CloseResult(
+            symbol, pos.side, pos.entry_price, exit_price, pos.quantity,
+            net_pnl, pnl_pct, total_fee, reason,
+        )
 
-    def get_open_positions(self) -> list[dict]:
-        """Açık pozisyonları döndür."""
-        positions = []
+    def iter_open_positions(self) -> Iterator[dict]:
+        """Açık pozisyonları tek tek (tembel) üret."""
         for symbol, pos in self.open_positions.items():
-            positions.append({
+            yield {
                 "symbol": symbol,
                 "side": pos.side,
                 "entry_price": pos.entry_price,
@@ -337,5 +564,8 @@ class PositionManager:
                 "take_profit": pos.take_profit,
                 "trailing_stop": pos.trailing_stop,
                 "highest_price": pos.highest_price,
-            })
-        return positions
+            }
+
+    def get_open_positions(self) -> list[dict]:
+        """Açık pozisyonları döndür."""
+        return list(self.iter_open_positions())
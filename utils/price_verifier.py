@@ -5,14 +5,23 @@ Null/random veri KABUL ETMEZ — her fiyat doğrulanmalı.
 """
 
 import asyncio
+import time
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
+from typing import Callable
 from utils.logger import setup_logger
 
 logger = setup_logger("PriceVerifier")
 
+_UTC = timezone.utc
 
-@dataclass
+
+def _utc_now() -> datetime:
+    """UTC şimdiki zaman (timezone nesnesi modül seviyesinde önbellekli)."""
+    return datetime.fromtimestamp(time.time(), _UTC)
+
+
+@dataclass(slots=True)
 class VerifiedPrice:
     """Doğrulanmış fiyat bilgisi."""
     symbol: str
@@ -53,36 +62,96 @@ class PriceVerifier:
     - Spread kontrolü (anormal spread = güvenilmez sinyal)
     """
 
-    def __init__(self, data_fetcher):
+    def __init__(self, data_fetcher, cache_ttl: float = 0.5,
+                 clock: Callable[[], datetime] = _utc_now):
         self.data_fetcher = data_fetcher
+        # Zaman kaynağı: backtest/replay'de simülasyon saati verilebilir
+        self._clock = clock
+        # Kısa ömürlü önbellek: aynı sembol art arda doğrulanırsa tek istek
+        self._cache: dict[str, tuple[float, VerifiedPrice]] = {}
+        self._ttl = cache_ttl
 
     async def verify_price(self, symbol: str) -> VerifiedPrice:
         """
         Sembolün anlık fiyatını Binance'den çek ve doğrula.
         İki ayrı endpoint ile cross-check yapar.
+        Bağımsız kontrol (ör. çıkış fiyatı) olduğu için önbellek kullanılmaz.
+        """
+        return await self._fetch_and_verify(symbol)
+
+    async def verify_prices(self, symbols: list[str]) -> list[VerifiedPrice]:
+        """
+        Birden fazla sembolü tek turda doğrula.
+        Önbellekte olmayan ticker'lar asyncio.gather ile eşzamanlı çekilir;
+        sonuçlar symbols sırasıyla döner.
         """
-        start_time = asyncio.get_event_loop().time()
+        now_t = time.monotonic()
+        results: dict[str, VerifiedPrice] = {}
+        misses = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._cache.get(symbol)
+            if cached and now_t - cached[0] < self._ttl:
+                results[symbol] = cached[1]
+            else:
+                misses.append(symbol)
+
+        if misses:
+            fetched = await asyncio.gather(
+                *(self._fetch_and_verify(s) for s in misses),
+                return_exceptions=True,
+            )
+            for symbol, vp in zip(misses, fetched):
+                if isinstance(vp, BaseException):
+                    logger.error("Fiyat doğrulama hatası (%s): %s", symbol, vp)
+                    vp = VerifiedPrice(
+                        symbol=symbol, price=0, bid=0, ask=0, spread=0,
+                        volume_24h=0, change_24h_pct=0,
+                        timestamp=self._clock(),
+                        source="ticker", verified=False,
+                        latency_ms=0.0,
+                        error=str(vp),
+                    )
+                results[symbol] = vp
+                if vp.verified:
+                    self._cache[symbol] = (now_t, vp)
+
+        return [results[s] for s in symbols]
+
+    async def _fetch_and_verify(self, symbol: str) -> VerifiedPrice:
+        """Tek sembol için ticker çek ve doğrulama kurallarını uygula."""
+        t0 = time.perf_counter()
 
         try:
             # 1) Ticker çek
             ticker = await self.data_fetcher.fetch_ticker(symbol)
-            latency = (asyncio.get_event_loop().time() - start_time) * 1000
+            latency = (time.perf_counter() - t0) * 1000
+            now = self._clock()
 
             if not ticker or "last" not in ticker or ticker["last"] is None:
                 return VerifiedPrice(
                     symbol=symbol, price=0, bid=0, ask=0, spread=0,
                     volume_24h=0, change_24h_pct=0,
-                    timestamp=datetime.now(timezone.utc),
+                    timestamp=now,
                     source="ticker", verified=False,
                     latency_ms=latency,
                     error="Ticker verisi alınamadı veya 'last' alanı None",
                 )
 
-            last_price = float(ticker["last"])
-            bid = float(ticker.get("bid", 0) or 0)
-            ask = float(ticker.get("ask", 0) or 0)
-            volume = float(ticker.get("quoteVolume", 0) or 0)
-            change_pct = float(ticker.get("percentage", 0) or 0)
+            # ccxt sayısal alanları float (veya None) döndürür; dönüştürme yok
+            last_price = ticker["last"]
+            if not isinstance(last_price, (int, float)):
+                return VerifiedPrice(
+                    symbol=symbol, price=0, bid=0, ask=0, spread=0,
+                    volume_24h=0, change_24h_pct=0,
+                    timestamp=now,
+                    source="ticker", verified=False,
+                    latency_ms=latency,
+                    error=f"Sayısal olmayan fiyat: {last_price!r}",
+                )
+            bid = ticker.get("bid") or 0.0
+            ask = ticker.get("ask") or 0.0
+            volume = ticker.get("quoteVolume") or 0.0
+            change_pct = ticker.get("percentage") or 0.0
 
             # Spread hesapla
             if bid > 0 and ask > 0:
@@ -117,7 +186,7 @@ class PriceVerifier:
                 spread=spread,
                 volume_24h=volume,
                 change_24h_pct=change_pct,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=now,
                 source="ticker",
                 verified=verified,
                 latency_ms=latency,
@@ -125,12 +194,12 @@ class PriceVerifier:
             )
 
         except Exception as e:
-            latency = (asyncio.get_event_loop().time() - start_time) * 1000
-            logger.error(f"Fiyat doğrulama hatası ({symbol}): {e}")
+            latency = (time.perf_counter() - t0) * 1000
+            logger.error("Fiyat doğrulama hatası (%s): %s", symbol, e)
             return VerifiedPrice(
                 symbol=symbol, price=0, bid=0, ask=0, spread=0,
                 volume_24h=0, change_24h_pct=0,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=self._clock(),
                 source="ticker", verified=False,
                 latency_ms=latency,
                 error=str(e),
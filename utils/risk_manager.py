@@ -3,8 +3,9 @@ Risk Yönetimi Modülü
 Pozisyon boyutlama, stop-loss, drawdown koruması
 """
 
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from utils.logger import setup_logger
 import numpy as np
 from config import (
@@ -14,12 +15,138 @@ from config import (
     MAKER_FEE, TAKER_FEE, SLIPPAGE_PCT,
     KELLY_SIZING_ENABLED, KELLY_FRACTION, KELLY_MAX_PCT,
     CORRELATION_ENABLED, MAX_CORRELATION_THRESHOLD, CORRELATION_LOOKBACK_HOURS,
+    PRIMARY_TIMEFRAME,
 )
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = setup_logger("RiskManager")
 
 
-@dataclass
+if NUMBA_AVAILABLE:
+    # Açık imzalar: import sırasında derlenir. float32 girdi yarı bant genişliği;
+    # toplamlar float64'te. fastmath yalnızca yeniden sıralama/contract —
+    # NaN/inf semantiği korunur (düz seri → atlanır)
+    @njit(["f8(f4[:, ::1], f8)", "f8(f8[:, :], f8)"], cache=True,
+          fastmath={"reassoc", "contract"})
+    def _max_abs_corr_vs_row0(returns, threshold):
+        """Satır 0'ın getirileri ile diğer satırlar arasındaki en yüksek |korelasyon|.
+
+        threshold aşıldığında erken döner (karar için yeterli).
+        """
+        n, k = returns.shape
+        rets = np.empty((n, k))
+        norms = np.empty(n)
+        for i in range(n):
+            total = 0.0
+            for j in range(k):
+                r = returns[i, j]
+                rets[i, j] = r
+                total += r
+            mean = total / k
+            ss = 0.0
+            for j in range(k):
+                rets[i, j] -= mean
+                ss += rets[i, j] * rets[i, j]
+            norms[i] = np.sqrt(ss)
+
+        if not (norms[0] > 0.0 and np.isfinite(norms[0])):
+            return 0.0
+        max_corr = 0.0
+        for i in range(1, n):
+            if not (norms[i] > 0.0 and np.isfinite(norms[i])):
+                continue
+            dot = 0.0
+            for j in range(k):
+                dot += rets[0, j] * rets[i, j]
+            c = abs(dot / (norms[0] * norms[i]))
+            if c > max_corr:
+                max_corr = c
+                if max_corr >= threshold:
+                    return max_corr
+        return max_corr
+else:
+    def _max_abs_corr_vs_row0(returns, threshold):
+        """Satır 0'ın getirileri ile diğer satırlar arasındaki en yüksek |korelasyon| (NumPy)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.abs(np.corrcoef(returns)[0, 1:])
+        corr = corr[np.isfinite(corr)]
+        return float(corr.max()) if corr.size else 0.0
+
+
+class CorrelationCache:
+    """Bar bazlı EWMA korelasyon önbelleği (RiskMetrics, λ≈0.94).
+
+    Her sembol için EWMA ortalama; her sembol çifti için aynı bara düşen
+    getirilerden EWMA kovaryans ve varyanslar tutulur. Okuma O(1).
+    """
+
+    def __init__(self, lam: float = 0.94, min_obs: int = 20):
+        self.lam = lam
+        self.min_obs = min_obs
+        self._mean: dict[str, float] = {}
+        self._last: dict[str, tuple] = {}   # sym → (bar, ortalamadan sapma)
+        self._pairs: dict[tuple[str, str], list] = {}  # (a, b) → [n, cov, var_a, var_b]
+
+    def update(self, sym: str, ret: float, bar) -> None:
+        """Kapanmış bir barın getirisini işle (aynı/eski bar tekrar sayılmaz)."""
+        last = self._last.get(sym)
+        if last is not None and bar <= last[0]:
+            return
+        if not np.isfinite(ret):
+            return
+        lam = self.lam
+        mean = self._mean.get(sym)
+        mean = ret if mean is None else lam * mean + (1 - lam) * ret
+        self._mean[sym] = mean
+        dev = ret - mean
+        self._last[sym] = (bar, dev)
+
+        # Aynı bar için getirisi gelmiş diğer sembollerle çiftleri güncelle
+        for other, (other_bar, other_dev) in self._last.items():
+            if other == sym or other_bar != bar:
+                continue
+            if sym < other:
+                key, da, db = (sym, other), dev, other_dev
+            else:
+                key, da, db = (other, sym), other_dev, dev
+            st = self._pairs.get(key)
+            if st is None:
+                self._pairs[key] = [1, da * db, da * da, db * db]
+            else:
+                st[0] += 1
+                st[1] = lam * st[1] + (1 - lam) * da * db
+                st[2] = lam * st[2] + (1 - lam) * da * da
+                st[3] = lam * st[3] + (1 - lam) * db * db
+
+    def corr(self, a: str, b: str) -> float | None:
+        """EWMA korelasyon; yeterli ortak gözlem yoksa None."""
+        st = self._pairs.get((a, b) if a < b else (b, a))
+        if st is None or st[0] < self.min_obs:
+            return None
+        denom = st[2] * st[3]
+        if denom <= 0.0:
+            return None
+        return st[1] / np.sqrt(denom)
+
+
+# Korelasyon penceresi: CORRELATION_LOOKBACK_HOURS kadar PRIMARY_TIMEFRAME barı (en az 10)
+_TF_UNIT_MINUTES = {"m": 1, "h": 60, "d": 1440}
+_CORRELATION_MAX_BARS = max(
+    10,
+    CORRELATION_LOOKBACK_HOURS * 60
+    // (int(PRIMARY_TIMEFRAME[:-1]) * _TF_UNIT_MINUTES[PRIMARY_TIMEFRAME[-1]]),
+)
+
+# Komisyon + slippage oranı, is_maker ile indekslenir: (taker, maker)
+_FEE_SLIP_RATE = (TAKER_FEE + SLIPPAGE_PCT, MAKER_FEE + SLIPPAGE_PCT)
+
+
+@dataclass(slots=True)
 class TradeRecord:
     """Tek bir trade kaydı."""
     symbol: str
@@ -48,6 +175,7 @@ class RiskManager:
         self.daily_pnl = 0.0
         self.daily_trades = 0
         self.today = date.today()
+        self._next_day_ts = self._next_midnight_ts(self.today)
         self.consecutive_losses = 0
         self.total_trades = 0
         self.winning_trades = 0
@@ -56,14 +184,36 @@ class RiskManager:
         self.total_fees = 0.0
         self.trade_history: list[TradeRecord] = []
         self.is_trading_halted = False
+        # Açık pozisyon sayacı — can_trade geçmişi taramaz
+        self.open_positions_count = 0
+        # Kapanan trade pnl_pct toplamları — Kelly ve get_stats geçmişi taramaz
+        self._win_pct_sum = 0.0        # pnl > 0
+        self._loss_abs_pct_sum = 0.0   # pnl <= 0, |pnl_pct| (Kelly)
+        self._neg_pct_sum = 0.0        # pnl < 0 (get_stats)
+        self._neg_count = 0
+        # Kapanan trade pnl_pct sütunu (kayıt sırası; dolunca kapasite ikiye katlanır)
+        self._closed_pnl_pct = np.empty(1024)
+        self._closed_n = 0
+        # Bar bazlı EWMA korelasyon (fiyat akışından beslenir)
+        self.corr_cache = CorrelationCache()
+        # Getiri önbelleği: sym → (bar zaman damgası, uzunluk, son fiyat, getiriler)
+        self._returns_cache: dict[str, tuple] = {}
+
+    @staticmethod
+    def _next_midnight_ts(day: date) -> float:
+        """Verilen günden sonraki yerel gece yarısının epoch zamanı."""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
 
     def reset_daily(self):
-        """Günlük metrikleri sıfırla."""
+        """Günlük metrikleri sıfırla (gün dönümü epoch karşılaştırmasıyla)."""
+        if time.time() < self._next_day_ts:
+            return
         if date.today() != self.today:
             self.daily_pnl = 0.0
             self.daily_trades = 0
             self.today = date.today()
             logger.info("Günlük metrikler sıfırlandı")
+        self._next_day_ts = self._next_midnight_ts(self.today)
 
     def can_trade(self) -> tuple[bool, str]:
         """Trade yapılabilir mi kontrol et."""
@@ -84,7 +234,7 @@ class RiskManager:
             return False, f"Max drawdown aşıldı: {drawdown:.2%}"
 
         # Eşzamanlı pozisyon limiti
-        open_positions = sum(1 for t in self.trade_history if t.status == "open")
+        open_positions = self.open_positions_count
         if open_positions >= MAX_CONCURRENT_POSITIONS:
             return False, f"Max pozisyon limiti: {open_positions}/{MAX_CONCURRENT_POSITIONS}"
 
@@ -162,16 +312,16 @@ class RiskManager:
             # Yeterli veri yok → standart boyutlama
             return self.calculate_position_size(entry_price, stop_loss_price)
 
-        closed = [t for t in self.trade_history if t.status == "closed"]
-        if len(closed) < 10:
+        closed = self.total_trades
+        if closed < 10:
             return self.calculate_position_size(entry_price, stop_loss_price)
 
-        wins = [t.pnl_pct for t in closed if t.pnl > 0]
-        losses = [abs(t.pnl_pct) for t in closed if t.pnl <= 0]
+        wins = self.winning_trades
+        losses = self.losing_trades
 
-        win_rate = len(wins) / len(closed)
-        avg_win = sum(wins) / len(wins) / 100 if wins else 0.03
-        avg_loss = sum(losses) / len(losses) / 100 if losses else 0.015
+        win_rate = wins / closed
+        avg_win = self._win_pct_sum / wins / 100 if wins else 0.03
+        avg_loss = self._loss_abs_pct_sum / losses / 100 if losses else 0.015
 
         kelly_pct = self.calculate_kelly_position_size(win_rate, avg_win, avg_loss)
         position_value = self.current_capital * kelly_pct
@@ -179,13 +329,15 @@ class RiskManager:
         return quantity
 
     def check_correlation(self, new_symbol: str, open_symbols: list[str],
-                          price_histories: dict) -> tuple[bool, float]:
+                          price_histories: dict,
+                          bar_times: dict | None = None) -> tuple[bool, float]:
         """Yeni pozisyon mevcut pozisyonlarla yüksek korelasyonlu mu kontrol et.
 
         Args:
             new_symbol: Açılmak istenen sembol
             open_symbols: Zaten açık pozisyonların sembolleri
             price_histories: {symbol: pd.Series(close prices)} için dict
+            bar_times: {symbol: son barın zaman damgası}; verilirse getiriler önbelleklenir
 
         Returns:
             (can_open: bool, max_correlation: float)
@@ -193,34 +345,78 @@ class RiskManager:
         if not CORRELATION_ENABLED or not open_symbols:
             return True, 0.0
 
-        if new_symbol not in price_histories:
-            return True, 0.0
+        # Önbellekten oku: eşiği aşan ilk çiftte karar verilmiş olur; tüm
+        # çiftler ısınmışsa ham seriye hiç dokunma
+        max_corr = 0.0
+        n_cached = 0
+        n_pairs = 0
+        for s in open_symbols:
+            if s == new_symbol:
+                continue
+            n_pairs += 1
+            c = self.corr_cache.corr(new_symbol, s)
+            if c is None:
+                continue
+            c = abs(c)
+            if c >= MAX_CORRELATION_THRESHOLD:
+                return self._correlation_verdict(new_symbol, c)
+            n_cached += 1
+            if c > max_corr:
+                max_corr = c
+        if n_pairs and n_cached == n_pairs:
+            return self._correlation_verdict(new_symbol, max_corr)
 
         new_prices = price_histories.get(new_symbol)
         if new_prices is None or len(new_prices) < 10:
             return True, 0.0
 
-        max_corr = 0.0
-        for sym in open_symbols:
-            if sym == new_symbol or sym not in price_histories:
-                continue
-            existing_prices = price_histories[sym]
-            if existing_prices is None or len(existing_prices) < 10:
-                continue
-            try:
-                # Eşit uzunlukta al
-                min_len = min(len(new_prices), len(existing_prices))
-                p1 = np.array(new_prices[-min_len:], dtype=float)
-                p2 = np.array(existing_prices[-min_len:], dtype=float)
-                # Returns üzerinden korelasyon (daha anlamlı)
-                r1 = np.diff(p1) / p1[:-1]
-                r2 = np.diff(p2) / p2[:-1]
-                corr = float(np.corrcoef(r1, r2)[0, 1])
-                if abs(corr) > max_corr:
-                    max_corr = abs(corr)
-            except Exception:
-                continue
+        # Geçerli geçmişi olan açık semboller (döngü içi kontroller yerine tek filtre)
+        valid_syms = [
+            s for s in open_symbols
+            if s != new_symbol and price_histories.get(s) is not None
+            and len(price_histories[s]) >= 10
+        ]
+        if not valid_syms:
+            return True, 0.0
 
+        # Getiriler ortak uzunlukta tek float32, C-contiguous matrise: satır 0 = yeni sembol
+        min_len = min(_CORRELATION_MAX_BARS, len(new_prices),
+                      *(len(price_histories[s]) for s in valid_syms))
+        k = min_len - 1
+        bar_times = bar_times or {}
+        try:
+            returns = np.array(
+                [self._returns(new_symbol, new_prices, bar_times.get(new_symbol))[-k:]]
+                + [self._returns(s, price_histories[s], bar_times.get(s))[-k:]
+                   for s in valid_syms]
+            )
+        except Exception:
+            return True, 0.0
+        # Returns üzerinden korelasyon (daha anlamlı); eşik aşılınca erken çıkar
+        max_corr = _max_abs_corr_vs_row0(returns, MAX_CORRELATION_THRESHOLD)
+        return self._correlation_verdict(new_symbol, max_corr)
+
+    def _returns(self, sym: str, prices, bar_ts=None) -> np.ndarray:
+        """Sembolün basit getirileri (float32).
+
+        Önbellek anahtarı sembol + son barın zaman damgası (+ oluşan mumun
+        kapanışı); zaman damgası yoksa her seferinde hesaplanır.
+        """
+        last = prices[-1]
+        if bar_ts is not None:
+            hit = self._returns_cache.get(sym)
+            if (hit is not None and hit[0] == bar_ts and hit[1] == len(prices)
+                    and hit[2] == last):
+                return hit[3]
+        p = np.asarray(prices, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets = (np.diff(p) / p[:-1]).astype(np.float32)
+        if bar_ts is not None:
+            self._returns_cache[sym] = (bar_ts, len(prices), last, rets)
+        return rets
+
+    def _correlation_verdict(self, new_symbol: str, max_corr: float) -> tuple[bool, float]:
+        """En yüksek korelasyonu eşikle karşılaştır."""
         can_open = max_corr < MAX_CORRELATION_THRESHOLD
         if not can_open:
             logger.warning(
@@ -238,10 +434,8 @@ class RiskManager:
 
         stop_distance = max(atr_stop, min_stop)
 
-        if side == "buy":
-            return entry_price - stop_distance
-        else:
-            return entry_price + stop_distance
+        sign = 1.0 if side == "buy" else -1.0
+        return entry_price - sign * stop_distance
 
     def calculate_take_profit(self, entry_price: float, stop_loss_price: float,
                               side: str = "buy") -> float:
@@ -254,37 +448,40 @@ class RiskManager:
         max_tp = entry_price * 0.08
         reward = max(min_tp, min(reward, max_tp))
 
-        if side == "buy":
-            return entry_price + reward
-        else:
-            return entry_price - reward
+        sign = 1.0 if side == "buy" else -1.0
+        return entry_price + sign * reward
 
     def calculate_trailing_stop(self, current_price: float, entry_price: float,
                                 highest_price: float, side: str = "buy") -> float:
         """Trailing stop hesapla."""
-        if side == "buy":
-            # Fiyat yükseldikçe stop da yükselir
-            trail = highest_price * (1 - TRAILING_STOP_PCT)
-            return max(trail, entry_price * (1 - STOP_LOSS_PCT))
-        else:
-            lowest_price = current_price  # Placeholder
-            trail = lowest_price * (1 + TRAILING_STOP_PCT)
-            return min(trail, entry_price * (1 + STOP_LOSS_PCT))
+        sign = 1.0 if side == "buy" else -1.0
+        # Long: en yüksek fiyattan iz; short: anlık fiyat (placeholder lowest)
+        ref_price = highest_price if side == "buy" else current_price
+        trail = ref_price * (1 - sign * TRAILING_STOP_PCT)
+        floor = entry_price * (1 - sign * STOP_LOSS_PCT)
+        # Long'da max, short'ta min: sign ile tek ifade
+        return sign * max(sign * trail, sign * floor)
 
     def calculate_fees(self, quantity: float, price: float,
                        is_maker: bool = False) -> float:
-        """İşlem ücretlerini hesapla."""
-        fee_rate = MAKER_FEE if is_maker else TAKER_FEE
-        trade_value = quantity * price
-        fee = trade_value * fee_rate
-        slippage = trade_value * SLIPPAGE_PCT
-        return fee + slippage
+        """İşlem ücretlerini hesapla (komisyon + slippage tek oranla)."""
+        return quantity * price * _FEE_SLIP_RATE[is_maker]
+
+    def calculate_round_trip_fees(self, quantity: float, entry_price: float,
+                                  exit_price: float, is_maker: bool = False) -> float:
+        """Giriş + çıkış ücretleri tek ifadede (iki calculate_fees çağrısına eşdeğer)."""
+        return (entry_price + exit_price) * quantity * _FEE_SLIP_RATE[is_maker]
 
     def record_trade(self, trade: TradeRecord):
         """Trade sonucunu kaydet."""
         self.trade_history.append(trade)
 
-        if trade.status == "closed":
+        if trade.status == "open":
+            self.open_positions_count += 1
+        elif trade.status == "closed":
+            # Kapanış ayrı bir kayıt olarak gelir; açık sayacı düşür
+            if self.open_positions_count > 0:
+                self.open_positions_count -= 1
             self.total_trades += 1
             self.daily_trades += 1
             self.total_pnl += trade.pnl
@@ -292,12 +489,24 @@ class RiskManager:
             self.daily_pnl += trade.pnl
             self.current_capital += trade.pnl - trade.fee
 
+            if self._closed_n == self._closed_pnl_pct.size:
+                self._closed_pnl_pct = np.concatenate(
+                    (self._closed_pnl_pct, np.empty(self._closed_pnl_pct.size))
+                )
+            self._closed_pnl_pct[self._closed_n] = trade.pnl_pct
+            self._closed_n += 1
+
             if trade.pnl > 0:
                 self.winning_trades += 1
                 self.consecutive_losses = 0
+                self._win_pct_sum += trade.pnl_pct
             else:
                 self.losing_trades += 1
                 self.consecutive_losses += 1
+                self._loss_abs_pct_sum += abs(trade.pnl_pct)
+                if trade.pnl < 0:
+                    self._neg_pct_sum += trade.pnl_pct
+                    self._neg_count += 1
 
             # Peak capital güncelle
             if self.current_capital > self.peak_capital:
@@ -308,6 +517,10 @@ class RiskManager:
                 f"({trade.pnl_pct:.2f}%) | Sermaye: ${self.current_capital:.2f}"
             )
 
+    def closed_returns(self) -> np.ndarray:
+        """Kapanan trade getirileri (pnl_pct / 100), kayıt sırasıyla."""
+        return self._closed_pnl_pct[:self._closed_n] / 100
+
     def get_stats(self) -> dict:
         """Performans istatistiklerini döndür."""
         win_rate = (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0
@@ -318,11 +531,9 @@ class RiskManager:
         avg_win = 0.0
         avg_loss = 0.0
         if self.winning_trades > 0:
-            wins = [t.pnl_pct for t in self.trade_history if t.status == "closed" and t.pnl > 0]
-            avg_win = sum(wins) / len(wins) if wins else 0
+            avg_win = self._win_pct_sum / self.winning_trades
         if self.losing_trades > 0:
-            losses = [t.pnl_pct for t in self.trade_history if t.status == "closed" and t.pnl < 0]
-            avg_loss = sum(losses) / len(losses) if losses else 0
+            avg_loss = self._neg_pct_sum / self._neg_count if self._neg_count else 0
 
         return {
             "initial_capital": self.initial_capital,
@@ -11,7 +11,9 @@ ICT (Inner Circle Trader) session theory:
 - Dead Zone       : 20:00 - 23:59 UTC | Düşük hacim ❌
 """
 
+import time
 from datetime import datetime, timezone
+from types import MappingProxyType
 from utils.logger import setup_logger
 from config import (
     LONDON_KILLZONE_START, LONDON_KILLZONE_END,
@@ -22,6 +24,18 @@ from config import (
 
 logger = setup_logger("SessionKillzone")
 
+# Session kalitesi → sinyal skoru çarpanı (indeks = kalite, 0 kullanılmaz)
+_QUALITY_MULTIPLIERS = (
+    1.0,
+    0.5,   # Off hours
+    0.7,
+    0.85,  # Asia
+    0.95,
+    1.0,   # London/NY
+    1.2,   # Overlap
+)
+_QUALITY_RANGE = range(1, len(_QUALITY_MULTIPLIERS))
+
 
 # Session adları
 SESSIONS = {
@@ -33,72 +47,65 @@ SESSIONS = {
 }
 
 
-def get_current_session(dt: datetime = None) -> dict:
-    """
-    Verilen zaman için aktif trading session'ı döndür.
-    
-    Args:
-        dt: UTC datetime (None ise şu an)
-    
-    Returns:
-        dict: session_name, quality (1-6), is_killzone, emoji, description
-    """
-    if dt is None:
-        dt = datetime.now(timezone.utc)
-    
-    hour = dt.hour  # UTC saat
-    
+_SESSION_FIELDS = ("session", "quality", "is_killzone", "emoji", "description")
+
+
+def _session_tuple(hour: int) -> tuple:
+    """UTC saat → (session, quality, is_killzone, emoji, description)."""
     # London × NY Overlap (en değerli)
     if LONDON_KILLZONE_START <= hour < NY_KILLZONE_END and hour >= NY_KILLZONE_START:
         # 13:00-16:00 + London hâlâ aktif (08:00-12:00 UTC London close ~17:00)
         # Gerçek overlap UTC 13:00-16:00
         if NY_KILLZONE_START <= hour < min(NY_KILLZONE_END, 16):
-            return {
-                "session": "LONDON_NY_OVERLAP",
-                "quality": 6,
-                "is_killzone": True,
-                "emoji": "🔥",
-                "description": "London × NY Overlap - En Yüksek Likidite",
-            }
-    
+            return ("LONDON_NY_OVERLAP", 6, True, "🔥",
+                    "London × NY Overlap - En Yüksek Likidite")
+
     # London Killzone
     if LONDON_KILLZONE_START <= hour < LONDON_KILLZONE_END:
-        return {
-            "session": "LONDON_KILLZONE",
-            "quality": 5,
-            "is_killzone": True,
-            "emoji": "🇬🇧",
-            "description": "London Killzone - Yüksek Likidite",
-        }
-    
+        return ("LONDON_KILLZONE", 5, True, "🇬🇧", "London Killzone - Yüksek Likidite")
+
     # NY Killzone
     if NY_KILLZONE_START <= hour < NY_KILLZONE_END:
-        return {
-            "session": "NY_KILLZONE",
-            "quality": 5,
-            "is_killzone": True,
-            "emoji": "🇺🇸",
-            "description": "NY Killzone - Yüksek Likidite",
-        }
-    
+        return ("NY_KILLZONE", 5, True, "🇺🇸", "NY Killzone - Yüksek Likidite")
+
     # Asia Killzone
     if ASIA_KILLZONE_START <= hour < ASIA_KILLZONE_END:
-        return {
-            "session": "ASIA_KILLZONE",
-            "quality": 3,
-            "is_killzone": True,
-            "emoji": "🌏",
-            "description": "Asia Killzone - Orta Likidite",
-        }
-    
+        return ("ASIA_KILLZONE", 3, True, "🌏", "Asia Killzone - Orta Likidite")
+
     # Off hours
-    return {
-        "session": "OFF_HOURS",
-        "quality": 1,
-        "is_killzone": False,
-        "emoji": "😴",
-        "description": f"Düşük Hacim Saati (UTC {hour:02d}:xx)",
-    }
+    return ("OFF_HOURS", 1, False, "😴", f"Düşük Hacim Saati (UTC {hour:02d}:xx)")
+
+
+# UTC saat → paylaşılan, salt-okunur session kaydı (import sırasında bir kez kurulur)
+_HOUR_TABLE = tuple(
+    MappingProxyType(dict(zip(_SESSION_FIELDS, _session_tuple(hour))))
+    for hour in range(24)
+)
+
+# _TRADEABLE[hour][min_quality] → kalite eşiği geçiliyor mu (min_quality 0-7)
+_TRADEABLE = tuple(
+    tuple(record["quality"] >= q for q in range(8))
+    for record in _HOUR_TABLE
+)
+
+
+def _utc_hour() -> int:
+    """Şu anki UTC saati — datetime nesnesi oluşturmadan (epoch UTC tabanlı)."""
+    return int(time.time() // 3600) % 24
+
+
+def get_current_session(dt: datetime = None) -> dict:
+    """
+    Verilen zaman için aktif trading session'ı döndür.
+    
+    Args:
+        dt: UTC datetime (None ise şu an)
+    
+    Returns:
+        dict: session_name, quality (1-6), is_killzone, emoji, description
+    """
+    # Paylaşılan salt-okunur kaydın kopyası: çağıran değiştirebilir / JSON'a yazabilir
+    return dict(_HOUR_TABLE[_utc_hour() if dt is None else dt.hour])
 
 
 def is_tradeable_session(min_quality: int = 3, dt: datetime = None) -> tuple[bool, dict]:
@@ -112,14 +119,16 @@ def is_tradeable_session(min_quality: int = 3, dt: datetime = None) -> tuple[boo
     Returns:
         tuple[bool, dict]: (tradeable, session_info)
     """
+    hour = _utc_hour() if dt is None else dt.hour
+    record = _HOUR_TABLE[hour]
     if not SESSION_FILTER_ENABLED:
-        session = get_current_session(dt)
-        session["filtered"] = False
-        return True, session
+        return True, {**record, "filtered": False}
     
-    session = get_current_session(dt)
-    tradeable = session["quality"] >= min_quality
-    session["filtered"] = not tradeable
+    if isinstance(min_quality, int) and 0 <= min_quality < 8:
+        tradeable = _TRADEABLE[hour][min_quality]
+    else:
+        tradeable = record["quality"] >= min_quality
+    session = {**record, "filtered": not tradeable}
     
     if not tradeable:
         logger.debug(
@@ -137,9 +146,9 @@ def get_next_killzone() -> dict:
     Returns:
         dict: session_name, hours_until, minutes_until
     """
-    now_utc = datetime.now(timezone.utc)
-    hour = now_utc.hour
-    minute = now_utc.minute
+    now_min = int(time.time() // 60)
+    hour = now_min // 60 % 24
+    minute = now_min % 60
     
     # Killzone başlangıç saatleri
     killzones = [
@@ -180,15 +189,10 @@ def session_score_multiplier(session_info: dict) -> float:
         float: 0.5 (off hours) ile 1.2 (overlap) arasında çarpan
     """
     quality = session_info.get("quality", 1)
-    multipliers = {
-        1: 0.5,   # Off hours
-        2: 0.7,
-        3: 0.85,  # Asia
-        4: 0.95,
-        5: 1.0,   # London/NY
-        6: 1.2,   # Overlap
-    }
-    return multipliers.get(quality, 1.0)
+    # dict.get ile aynı: 5.0 gibi eşit sayılar eşleşir, tamsayı olmayanlar 1.0'a düşer
+    if quality in _QUALITY_RANGE:
+        return _QUALITY_MULTIPLIERS[int(quality)]
+    return 1.0
 
 
 def format_session_status() -> str:
@@ -4,21 +4,87 @@ Her sinyali kaydeder, fiyat doğrulama yapar, sonucunu izler.
 Tüm detaylar JSON'da kalıcı olarak saklanır.
 """
 
+import atexit
 import json
 import os
 import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from itertools import islice
+import numpy as np
 from datetime import datetime, timezone, timedelta
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
+from operator import itemgetter
 from typing import Optional
 from utils.logger import setup_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = setup_logger("SignalTracker")
 
-SIGNALS_FILE = "data/signals_history.json"
+SIGNALS_FILE = "data/signals_history.jsonl"       # append-only olay günlüğü
+LEGACY_SIGNALS_FILE = "data/signals_history.json"  # eski tam-dizi formatı (tek seferlik geçiş)
 STATS_FILE = "data/signal_stats.json"
+COMPACT_BYTES = 10 * 1024 * 1024                   # Günlük bu boyutu aşınca sıkıştır
+RECENT_MAXLEN = 1024                               # get_recent_signals halka tamponu
+ARCHIVE_FILE = "data/signals_archive.jsonl"        # soğuk katman: bellekten atılan kapanmış kayıtlar
+MAX_IN_MEM = 5000                                  # Bellekte tutulan en fazla kayıt
+ARCHIVE_BATCH = 500                                # Arşivlemede sınırın bu kadar altına in
+_COLD_STATUSES = ("CLOSED", "REJECTED")            # Yalnız bunlar arşive gidebilir
+
+
+if ORJSON_AVAILABLE:
+    # numpy skalerleri sayı olarak yazılır; kalan bilinmeyen tipler str (json default=str gibi)
+    def _dumps_line(entry: dict) -> bytes:
+        return orjson.dumps(
+            entry, default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+        )
+
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(
+            obj, default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+        )
+
+    _loads = orjson.loads
+else:
+    def _dumps_line(entry: dict) -> bytes:
+        return (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
 
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode("utf-8")
 
-@dataclass
+    _loads = json.loads
+
+
+def _readable_utc(now: datetime) -> str:
+    """"%d.%m.%Y %H:%M:%S UTC" biçimi — strftime yerine sabit f-string."""
+    return (
+        f"{now.day:02d}.{now.month:02d}.{now.year} "
+        f"{now.hour:02d}:{now.minute:02d}:{now.second:02d} UTC"
+    )
+
+
+@dataclass(slots=True)
 class SignalRecord:
     """Tek bir sinyal kaydı — tüm detaylarıyla."""
     # Kimlik
@@ -67,6 +133,7 @@ class SignalRecord:
     exit_time: str = ""
     exit_time_readable: str = ""
     duration_seconds: int = 0        # Pozisyon açık kalma süresi
+    signal_time_epoch: float = 0.0   # signal_time'ın epoch karşılığı (eski kayıtlarda 0)
     
     # Doğrulama
     result: str = ""                 # WIN / LOSS / PENDING
@@ -78,7 +145,77 @@ class SignalRecord:
     change_24h_pct: float = 0.0
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        d = {name: getattr(self, name) for name in _SIGNAL_FIELDS}
+        d["reasons"] = list(self.reasons)  # tek değişebilir alan: asdict gibi kopyala
+        return d
+
+
+_SIGNAL_FIELDS = tuple(f.name for f in fields(SignalRecord))
+_signal_values = itemgetter(*_SIGNAL_FIELDS)
+
+# Sonuç sütunu kodları (kayıt sırasıyla; arşivlenen kayıtların satırları da durur)
+RESULT_OPEN = 0        # kapanmamış
+RESULT_WIN = 1
+RESULT_LOSS = -1
+RESULT_OTHER = 2       # kapanmış ama WIN/LOSS dışı (seriyi böler)
+_RESULT_CODES = {"WIN": RESULT_WIN, "LOSS": RESULT_LOSS}
+
+
+if NUMBA_AVAILABLE:
+    @njit("Tuple((i8, i8, i8, i8))(i1[:], f8[:])", cache=True)
+    def _order_stats(codes, pnl_pct):
+        """Tek geçiş: en uzun WIN/LOSS serisi, en iyi/en kötü satır (-1 = yok).
+
+        Kapanmamış satırlar (kod 0) atlanır; eşitlikte ilk satır.
+        """
+        max_wins = max_losses = cur = 0
+        last = 0
+        best = worst = -1
+        for i in range(codes.size):
+            c = codes[i]
+            if c == 0:
+                continue
+            if c == last:
+                cur += 1
+            else:
+                last = c
+                cur = 1
+            if c == 1:
+                if cur > max_wins:
+                    max_wins = cur
+            elif c == -1:
+                if cur > max_losses:
+                    max_losses = cur
+            if best < 0 or pnl_pct[i] > pnl_pct[best]:
+                best = i
+            if worst < 0 or pnl_pct[i] < pnl_pct[worst]:
+                worst = i
+        return max_wins, max_losses, best, worst
+else:
+    def _order_stats(codes, pnl_pct):
+        """En uzun WIN/LOSS serisi, en iyi/en kötü satır (-1 = yok) — NumPy."""
+        rows = np.flatnonzero(codes)
+        if rows.size == 0:
+            return 0, 0, -1, -1
+        closed = codes[rows]
+        starts = np.flatnonzero(np.r_[True, closed[1:] != closed[:-1]])
+        lengths = np.diff(np.r_[starts, closed.size])
+        values = closed[starts]
+        wins = lengths[values == RESULT_WIN]
+        losses = lengths[values == RESULT_LOSS]
+        pct = pnl_pct[rows]
+        return (int(wins.max()) if wins.size else 0,
+                int(losses.max()) if losses.size else 0,
+                int(rows[np.argmax(pct)]), int(rows[np.argmin(pct)]))
+
+
+def _record_from_dict(d: dict) -> SignalRecord:
+    """Diskten gelen dict'ten kayıt — tüm alanlar varsa konumsal kurulum (**kwargs yok)."""
+    try:
+        return SignalRecord(*_signal_values(d))
+    except KeyError:
+        # Eksik alanlı (eski) kayıt: dataclass varsayılanlarıyla
+        return SignalRecord(**d)
 
 
 class SignalTracker:
@@ -88,36 +225,421 @@ class SignalTracker:
     - Fiyat doğrulaması yapılır
     - Sonuçlar izlenir
     - İstatistikler güncellenir
+
+    read_only=True: yalnız okuma (raporlama betikleri) — yazıcı thread, atexit,
+    migrasyon ve sıkıştırma yok; değişiklikler diske inmez.
     """
 
-    def __init__(self):
+    def __init__(self, read_only: bool = False):
+        self._read_only = read_only
         self.signals: list[SignalRecord] = []
         self.active_signals: dict[str, SignalRecord] = {}  # symbol → signal
+        self._by_id: dict[str, SignalRecord] = {}          # signal_id → signal (ilk kayıt)
+        self._recent: deque[SignalRecord] = deque(maxlen=RECENT_MAXLEN)
+        # Debounce: her değişiklikte değil, eşik/süre dolunca yaz
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+        self._flush_threshold = 32
+        self._flush_interval_s = 5.0
+        self._pending: list[bytes] = []  # Diske eklenmeyi bekleyen JSONL satırları
+        # get_statistics önbelleği: değişiklik olunca ya da gün dönünce yeniden hesaplanır
+        self._stats_cache: Optional[dict] = None
+        self._stats_day = ""
+        self._stats_dirty = True
+        self._stats_unsaved = True      # STATS_FILE son yazımdan beri eskidi mi
+        # Artımlı sayaçlar — get_statistics geçmişi toplamak için taramaz
+        self._reset_counters()
+        # Disk G/Ç event loop dışında: tek yazıcı thread, sıralı iş kuyruğu
+        self._log_bytes = 0
+        self._write_queue: queue.Queue = queue.Queue()
+        if not read_only:
+            threading.Thread(
+                target=self._writer_loop, name="SignalTrackerWriter", daemon=True
+            ).start()
         self._load_history()
+        if not read_only:
+            atexit.register(self._shutdown_flush)
 
     def _load_history(self):
-        """Geçmiş sinyalleri dosyadan yükle."""
+        """Geçmiş sinyalleri dosyadan yükle (JSONL günlüğünü baştan oynat)."""
         try:
+            archive_times = self._load_archive() if os.path.exists(ARCHIVE_FILE) else None
             if os.path.exists(SIGNALS_FILE):
-                with open(SIGNALS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.signals = [SignalRecord(**s) for s in data]
-                    logger.info(f"Geçmiş yüklendi: {len(self.signals)} sinyal")
+                self._log_bytes = os.path.getsize(SIGNALS_FILE)
+                by_id = self._by_id
+                torn = False
+                with open(SIGNALS_FILE, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = _loads(line)
+                        except ValueError:
+                            # Çökme anında yarım kalmış satır: atla, geri kalanı kurtar
+                            logger.warning("Bozuk günlük satırı atlandı")
+                            torn = True
+                            continue
+                        if entry["op"] == "new":
+                            record = _record_from_dict(entry["record"])
+                            self.signals.append(record)
+                            by_id.setdefault(record.signal_id, record)
+                        else:
+                            record = by_id.get(entry["signal_id"])
+                            if record is not None:
+                                for key, value in entry["fields"].items():
+                                    setattr(record, key, value)
+                logger.info(f"Geçmiş yüklendi: {len(self.signals)} sinyal")
+                if torn and not self._read_only:
+                    self.compact()  # Yeni eklemeler yarım satıra yapışmasın
+            elif os.path.exists(LEGACY_SIGNALS_FILE):
+                with open(LEGACY_SIGNALS_FILE, "rb") as f:
+                    if IJSON_AVAILABLE:
+                        # Akış halinde: ara dict listesi bellekte tutulmaz
+                        self.signals = [
+                            _record_from_dict(s)
+                            for s in ijson.items(f, "item", use_float=True)
+                        ]
+                    else:
+                        self.signals = [_record_from_dict(s) for s in _loads(f.read())]
+                for record in self.signals:
+                    self._by_id.setdefault(record.signal_id, record)
+                logger.info(f"Eski format geçmiş yüklendi: {len(self.signals)} sinyal")
+                if not self._read_only:
+                    self.compact()  # → JSONL'e taşı
+            self._recent.extend(islice(self.signals, max(0, len(self.signals) - RECENT_MAXLEN), None))
+            # Açık kalan sinyaller (sembol başına en son aktif kayıt) ve sayaçlar
+            for record in self.signals:
+                if record.status == "ACTIVE":
+                    self.active_signals[record.symbol] = record
+                self._count_new(record)
+                self._status_counts[record.status] = self._status_counts.get(record.status, 0) + 1
+                if record.status == "CLOSED":
+                    self._count_closed(record)
+            if archive_times:
+                k = len(archive_times)
+                self._sort_rows(archive_times + [r.signal_time for r in self._row_refs[k:]])
         except Exception as e:
             logger.error(f"Geçmiş yükleme hatası: {e}")
             self.signals = []
+            self._by_id.clear()
+            self._recent.clear()
+            self.active_signals.clear()
+            self._reset_counters()
+
+    def _load_archive(self) -> list[str]:
+        """Arşivi akış halinde say: kayıtlar bellekte tutulmaz, sayaç ve sütunlara girer.
+
+        Sütun satırlarının signal_time listesini döndürür (sonra zamana göre sıralanır).
+        """
+        times: list[str] = []
+        best = worst = None
+        cold_rows = self._cold_rows
+        with open(ARCHIVE_FILE, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    d = _loads(line)
+                except ValueError:
+                    logger.warning("Bozuk arşiv satırı atlandı")
+                    continue
+                record = _record_from_dict(d)
+                self._count_new(record)
+                self._status_counts[record.status] = self._status_counts.get(record.status, 0) + 1
+                if record.status == "CLOSED":
+                    self._count_closed(record)
+                row = self._rows.pop(id(record))
+                self._row_refs[row] = None
+                times.append(record.signal_time)
+                # En iyi/en kötü adayları (eşitler dahil): sıralamadan sonra ilki seçilir
+                if self._col_result[row]:
+                    pct = self._col_pnl_pct[row]
+                    if best is None or pct >= best:
+                        best = pct
+                        cold_rows[row] = d
+                    if worst is None or pct <= worst:
+                        worst = pct
+                        cold_rows[row] = d
+        self._cold_rows = {
+            r: d for r, d in cold_rows.items() if self._col_pnl_pct[r] in (best, worst)
+        }
+        logger.info(f"Arşiv sayıldı: {len(times)} sinyal")
+        return times
+
+    def _sort_rows(self, times: list[str]):
+        """Sütun satırlarını kayıt zamanına göre diz (arşiv ve bellek iç içe geçer)."""
+        n = self._n_rows
+        perm = sorted(range(n), key=times.__getitem__)  # kararlı: eşit zamanda yükleme sırası
+        if all(i == p for i, p in enumerate(perm)):
+            return
+        idx = np.array(perm, dtype=np.int64)
+        inv = np.empty(n, dtype=np.int64)
+        inv[idx] = np.arange(n)
+        self._col_result[:n] = self._col_result[idx]
+        self._col_pnl_pct[:n] = self._col_pnl_pct[idx]
+        refs = self._row_refs
+        self._row_refs = [refs[i] for i in perm]
+        self._rows = {k: int(inv[r]) for k, r in self._rows.items()}
+        self._cold_rows = {int(inv[r]): d for r, d in self._cold_rows.items()}
+
+    def _archive_cold(self):
+        """En eski CLOSED/REJECTED kayıtları arşive taşı; ACTIVE/PENDING asla taşınmaz.
+
+        Sayaçlar ve sütun satırları kalır, istatistikler arşive bakmadan doğru kalır.
+        """
+        excess = len(self.signals) - MAX_IN_MEM + ARCHIVE_BATCH
+        active = self.active_signals
+        keep, cold = [], []
+        for s in self.signals:
+            if (excess > 0 and s.status in _COLD_STATUSES
+                    and active.get(s.symbol) is not s):
+                cold.append(s)
+                excess -= 1
+            else:
+                keep.append(s)
+        if not cold:
+            return
+        n = self._n_rows
+        _, _, best, worst = _order_stats(self._col_result[:n], self._col_pnl_pct[:n])
+        cold_rows = {r: d for r, d in self._cold_rows.items() if r in (best, worst)}
+        rows, refs, by_id = self._rows, self._row_refs, self._by_id
+        lines = []
+        for s in cold:
+            d = s.to_dict()
+            lines.append(_dumps_line(d))
+            row = rows.pop(id(s))
+            refs[row] = None
+            if row == best or row == worst:
+                cold_rows[row] = d
+            if by_id.get(s.signal_id) is s:
+                del by_id[s.signal_id]
+        self._cold_rows = cold_rows
+        self.signals = keep
+        # Önce arşive ekle, sonra günlüğü sıkıştır: çökmede kayıt kaybolmaz (en kötü çift kayıt)
+        self._write_queue.put(("append", ARCHIVE_FILE, lines))
+        self.compact()
+        logger.info(f"{len(cold)} sinyal arşivlendi, bellekte {len(keep)} kaldı")
+
+    def _row_dict(self, row: int) -> Optional[dict]:
+        """Sütun satırının kaydı (dict); arşivlenmişse saklanan kopya."""
+        if row < 0:
+            return None
+        record = self._row_refs[row]
+        return record.to_dict() if record is not None else self._cold_rows.get(row)
+
+    # ==================== SAYAÇLAR ====================
+
+    def _reset_counters(self):
+        self._status_counts: dict[str, int] = {}
+        self._counters = {
+            "buy_signals": 0, "sell_signals": 0,
+            "GOOD": 0, "WARNING": 0, "FAIL": 0,
+            "wins": 0, "losses": 0, "buy_wins": 0, "sell_wins": 0,
+            # sum() ile aynı: boşsa int 0
+            "total_pnl": 0, "total_fees": 0, "gross_profit": 0, "loss_net_sum": 0,
+            "sum_win_pct": 0, "sum_loss_pct": 0, "sum_duration": 0,
+        }
+        self._day_signals: dict[str, int] = {}     # "YYYY-MM-DD" → sinyal sayısı
+        self._day_closed: dict[str, tuple] = {}    # "YYYY-MM-DD" → (kapanan, net pnl)
+        # Sıra bağımlı metrikler için sütunlar (SoA): satır = sayım sırası (arşiv dahil)
+        self._col_result = np.zeros(1024, dtype=np.int8)
+        self._col_pnl_pct = np.zeros(1024)
+        self._n_rows = 0
+        self._rows: dict[int, int] = {}            # id(kayıt) → satır (yalnız bellektekiler)
+        self._row_refs: list[Optional[SignalRecord]] = []  # satır → kayıt (arşivlenmişse None)
+        self._cold_rows: dict[int, dict] = {}      # arşivlenmiş en iyi/en kötü satırların dict'i
+
+    def _count_new(self, s: SignalRecord):
+        """Kayıt anında sabitlenen alanların sayaçları (yön, kalite, gün)."""
+        c = self._counters
+        if s.direction == "BUY":
+            c["buy_signals"] += 1
+        elif s.direction == "SELL":
+            c["sell_signals"] += 1
+        if s.data_quality in ("GOOD", "WARNING", "FAIL"):
+            c[s.data_quality] += 1
+        day = s.signal_time[:10]
+        self._day_signals[day] = self._day_signals.get(day, 0) + 1
+        # Sütunlara yeni satır (dolunca kapasite ikiye katlanır)
+        row = self._n_rows
+        if row == self._col_result.size:
+            self._col_result = np.concatenate((self._col_result, np.zeros(row, dtype=np.int8)))
+            self._col_pnl_pct = np.concatenate((self._col_pnl_pct, np.zeros(row)))
+        self._rows[id(s)] = row
+        self._row_refs.append(s)
+        self._n_rows = row + 1
+
+    def _count_closed(self, s: SignalRecord):
+        """Kapanan trade'in katkısı (_uncount_closed ile simetrik)."""
+        c = self._counters
+        c["total_pnl"] += s.net_pnl
+        c["total_fees"] += s.fee
+        c["sum_duration"] += s.duration_seconds
+        if s.result == "WIN":
+            c["wins"] += 1
+            c["sum_win_pct"] += s.pnl_pct
+            c["gross_profit"] += s.net_pnl
+            if s.direction == "BUY":
+                c["buy_wins"] += 1
+            elif s.direction == "SELL":
+                c["sell_wins"] += 1
+        elif s.result == "LOSS":
+            c["losses"] += 1
+            c["sum_loss_pct"] += s.pnl_pct
+            c["loss_net_sum"] += s.net_pnl
+        day = s.exit_time[:10]
+        if day:
+            n, pnl = self._day_closed.get(day, (0, 0))
+            self._day_closed[day] = (n + 1, pnl + s.net_pnl)
+        row = self._rows[id(s)]
+        self._col_result[row] = _RESULT_CODES.get(s.result, RESULT_OTHER)
+        self._col_pnl_pct[row] = s.pnl_pct
+
+    def _uncount_closed(self, s: SignalRecord):
+        """CLOSED'dan çıkan kaydın katkısını geri al (yeniden aktifleşme / red)."""
+        c = self._counters
+        c["total_pnl"] -= s.net_pnl
+        c["total_fees"] -= s.fee
+        c["sum_duration"] -= s.duration_seconds
+        if s.result == "WIN":
+            c["wins"] -= 1
+            c["sum_win_pct"] -= s.pnl_pct
+            c["gross_profit"] -= s.net_pnl
+            if s.direction == "BUY":
+                c["buy_wins"] -= 1
+            elif s.direction == "SELL":
+                c["sell_wins"] -= 1
+        elif s.result == "LOSS":
+            c["losses"] -= 1
+            c["sum_loss_pct"] -= s.pnl_pct
+            c["loss_net_sum"] -= s.net_pnl
+        day = s.exit_time[:10]
+        if day and day in self._day_closed:
+            n, pnl = self._day_closed[day]
+            self._day_closed[day] = (n - 1, pnl - s.net_pnl)
+        row = self._rows[id(s)]
+        self._col_result[row] = RESULT_OPEN
+        self._col_pnl_pct[row] = 0.0
+
+    def _set_status(self, s: SignalRecord, status: str):
+        """Durum geçişi + durum sayaçları.
+
+        CLOSED'dan çıkan (ya da yeniden kapanacak) kaydın kapanış katkısı
+        geri alınır: sayaçlar her an yalnız güncel CLOSED kayıtları yansıtır.
+        """
+        if s.status == "CLOSED":
+            self._uncount_closed(s)
+        counts = self._status_counts
+        counts[s.status] -= 1
+        counts[status] = counts.get(status, 0) + 1
+        s.status = status
+
+    @staticmethod
+    def _encode(entry: dict) -> bytes:
+        return _dumps_line(entry)
+
+    def _append_record(self, entry: dict):
+        """Günlüğe bir olay ekle (new / update); yazma debounce ile toplu yapılır."""
+        self._stats_dirty = True
+        if self._read_only:
+            return  # Diske inmeyecek: kodlama ve tampon yok
+        self._pending.append(self._encode(entry))
+        self._stats_unsaved = True
+        self._mark_dirty()
+
+    def _append_update(self, signal_id: str, **fields):
+        """Mevcut kayda alan yaması olayı ekle."""
+        self._append_record({"op": "update", "signal_id": signal_id, "fields": fields})
+
+    def _writer_loop(self):
+        """Yazıcı thread: kuyruktaki (işlem, yol, satırlar) işlerini sırayla uygular."""
+        while True:
+            op, path, lines = self._write_queue.get()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if op == "append":
+                    with open(path, "ab") as f:
+                        f.writelines(lines)
+                        f.flush()
+                        os.fsync(f.fileno())   # parti başına bir fsync
+                else:  # "replace": yarım dosya asla hedef dosya olamaz
+                    tmp = path + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.writelines(lines)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, path)
+            except Exception as e:
+                logger.error(f"Dosya kaydetme hatası ({path}): {e}")
+            finally:
+                self._write_queue.task_done()
 
     def _save_history(self):
-        """Sinyal geçmişini dosyaya kaydet."""
-        try:
-            os.makedirs(os.path.dirname(SIGNALS_FILE), exist_ok=True)
-            with open(SIGNALS_FILE, "w", encoding="utf-8") as f:
-                json.dump(
-                    [s.to_dict() for s in self.signals],
-                    f, ensure_ascii=False, indent=2, default=str
-                )
-        except Exception as e:
-            logger.error(f"Geçmiş kaydetme hatası: {e}")
+        """Bekleyen olayları yazıcı thread'e tek parti olarak devret."""
+        if self._pending:
+            lines = self._pending
+            self._pending = []
+            self._log_bytes += sum(len(line) for line in lines)
+            self._write_queue.put(("append", SIGNALS_FILE, lines))
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+        if len(self.signals) > MAX_IN_MEM:
+            self._archive_cold()   # taşıma olursa günlük de sıkıştırılır
+        if self._log_bytes > COMPACT_BYTES:
+            self.compact()
+        if self._stats_unsaved:
+            self.save_stats_now()
+
+    def save_stats_now(self):
+        """Güncel istatistikleri STATS_FILE'a yazdır (flush ritminde çağrılır)."""
+        if self._read_only:
+            return
+        self._write_queue.put(("replace", STATS_FILE, [_dumps_pretty(self.get_statistics())]))
+        self._stats_unsaved = False
+
+    def compact(self):
+        """Günlüğü güncel durumun anlık görüntüsüyle yeniden yaz (kayıt başına tek satır).
+
+        Görüntü çağıran thread'de tutarlı biçimde alınır, yazma arka planda yapılır.
+        """
+        if self._read_only:
+            return
+        lines = [self._encode({"op": "new", "record": s.to_dict()}) for s in self.signals]
+        self._write_queue.put(("replace", SIGNALS_FILE, lines))
+        self._log_bytes = sum(len(line) for line in lines)
+        self._pending = []
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+
+    def _mark_dirty(self):
+        """Değişikliği işaretle; eşik veya süre dolduysa diske yaz."""
+        if self._read_only:
+            return
+        self._dirty += 1
+        if (self._dirty >= self._flush_threshold
+                or time.monotonic() - self._last_flush >= self._flush_interval_s):
+            self._save_history()
+
+    def _flush_if_dirty(self):
+        """Yazılmamış değişiklik varsa yazıcıya devret."""
+        if self._dirty:
+            self._save_history()
+
+    def _shutdown_flush(self):
+        """atexit: bekleyenleri devret ve yazıcının bitirmesini bekle."""
+        self._flush_if_dirty()
+        self._write_queue.join()
+
+    async def flush(self):
+        """Bekleyen değişiklikleri diske yaz ve tamamlanmasını bekle."""
+        self._flush_if_dirty()
+        await asyncio.to_thread(self._write_queue.join)
+
+    async def run_flush_loop(self):
+        """Arka plan görevi: sessiz dönemlerde de kirli kayıtlar diske iner."""
+        while True:
+            await asyncio.sleep(self._flush_interval_s)
+            self._flush_if_dirty()
 
     def record_signal(
         self,
@@ -132,7 +654,10 @@ class SignalTracker:
         verification: fiyat doğrulama sonucu
         """
         now = datetime.now(timezone.utc)
-        signal_id = f"{now.strftime('%Y%m%d_%H%M%S')}_{symbol.replace('/', '_')}"
+        signal_id = (
+            f"{now.year:04d}{now.month:02d}{now.day:02d}_"
+            f"{now.hour:02d}{now.minute:02d}{now.second:02d}_{symbol.replace('/', '_')}"
+        )
         
         vp = verification.get("verified_price")
         
@@ -141,7 +666,8 @@ class SignalTracker:
             symbol=symbol,
             direction=direction,
             signal_time=now.isoformat(),
-            signal_time_readable=now.strftime("%d.%m.%Y %H:%M:%S UTC"),
+            signal_time_epoch=now.timestamp(),
+            signal_time_readable=_readable_utc(now),
             composite_score=analysis.get("composite_score", 0),
             buy_strategies=analysis.get("buy_count", 0),
             sell_strategies=analysis.get("sell_count", 0),
@@ -163,13 +689,16 @@ class SignalTracker:
         )
 
         self.signals.append(record)
-        self._save_history()
+        self._recent.append(record)
+        self._by_id.setdefault(signal_id, record)
+        self._count_new(record)
+        self._status_counts[record.status] = self._status_counts.get(record.status, 0) + 1
+        self._append_record({"op": "new", "record": record.to_dict()})
         
         logger.info(
-            f"Sinyal kaydedildi: {signal_id} | {direction} {symbol} | "
-            f"Skor: {record.composite_score:.2f} | "
-            f"Doğrulama: {record.data_quality} | "
-            f"Sapma: %{record.price_deviation_pct:.3f}"
+            "Sinyal kaydedildi: %s | %s %s | Skor: %.2f | Doğrulama: %s | Sapma: %%%.3f",
+            signal_id, direction, symbol, record.composite_score,
+            record.data_quality, record.price_deviation_pct,
         )
         
         return record
@@ -180,19 +709,23 @@ class SignalTracker:
         quantity: float, position_size_usd: float
     ):
         """Sinyal aktif pozisyona dönüştü."""
-        for s in self.signals:
-            if s.signal_id == signal_id:
-                s.status = "ACTIVE"
-                s.entry_price = entry_price
-                s.stop_loss = stop_loss
-                s.take_profit = take_profit
-                s.quantity = quantity
-                s.position_size_usd = position_size_usd
-                self.active_signals[s.symbol] = s
-                self._save_history()
-                logger.info(f"Sinyal aktifleştirildi: {signal_id}")
-                return
-        logger.warning(f"Sinyal bulunamadı: {signal_id}")
+        s = self._by_id.get(signal_id)
+        if s is None:
+            logger.warning("Sinyal bulunamadı: %s", signal_id)
+            return
+        self._set_status(s, "ACTIVE")
+        s.entry_price = entry_price
+        s.stop_loss = stop_loss
+        s.take_profit = take_profit
+        s.quantity = quantity
+        s.position_size_usd = position_size_usd
+        self.active_signals[s.symbol] = s
+        self._append_update(
+            signal_id, status=s.status, entry_price=entry_price,
+            stop_loss=stop_loss, take_profit=take_profit,
+            quantity=quantity, position_size_usd=position_size_usd,
+        )
+        logger.info("Sinyal aktifleştirildi: %s", signal_id)
 
     def close_signal(
         self, symbol: str, exit_price: float, exit_reason: str,
@@ -200,20 +733,13 @@ class SignalTracker:
         exit_verified_price: float = 0.0, exit_data_quality: str = ""
     ) -> Optional[SignalRecord]:
         """Aktif sinyali kapat."""
-        if symbol not in self.active_signals:
-            # Tüm sinyallerde ara
-            for s in reversed(self.signals):
-                if s.symbol == symbol and s.status == "ACTIVE":
-                    self.active_signals[symbol] = s
-                    break
-            else:
-                logger.warning(f"Aktif sinyal bulunamadı: {symbol}")
-                return None
-
-        signal = self.active_signals.pop(symbol)
+        signal = self.active_signals.pop(symbol, None)
+        if signal is None:
+            logger.warning("Aktif sinyal bulunamadı: %s", symbol)
+            return None
         now = datetime.now(timezone.utc)
 
-        signal.status = "CLOSED"
+        self._set_status(signal, "CLOSED")
         signal.exit_price = exit_price
         signal.exit_reason = exit_reason
         signal.pnl = pnl
@@ -221,112 +747,95 @@ class SignalTracker:
         signal.fee = fee
         signal.net_pnl = pnl - fee
         signal.exit_time = now.isoformat()
-        signal.exit_time_readable = now.strftime("%d.%m.%Y %H:%M:%S UTC")
+        signal.exit_time_readable = _readable_utc(now)
         signal.result = "WIN" if pnl > 0 else "LOSS"
         signal.exit_verified_price = exit_verified_price
         signal.exit_data_quality = exit_data_quality
 
-        # Süre hesapla
-        try:
-            entry_time = datetime.fromisoformat(signal.signal_time)
-            signal.duration_seconds = int((now - entry_time).total_seconds())
-        except Exception:
-            signal.duration_seconds = 0
-
-        self._save_history()
+        # Süre hesapla — epoch farkı; epoch'suz eski kayıtlarda ISO parse
+        if signal.signal_time_epoch:
+            signal.duration_seconds = int(round(now.timestamp() - signal.signal_time_epoch, 6))
+        else:
+            try:
+                entry_time = datetime.fromisoformat(signal.signal_time)
+                signal.duration_seconds = int((now - entry_time).total_seconds())
+            except Exception:
+                signal.duration_seconds = 0
+        self._count_closed(signal)
+
+        self._append_update(
+            signal.signal_id, status=signal.status, exit_price=exit_price,
+            exit_reason=exit_reason, pnl=pnl, pnl_pct=pnl_pct, fee=fee,
+            net_pnl=signal.net_pnl, exit_time=signal.exit_time,
+            exit_time_readable=signal.exit_time_readable, result=signal.result,
+            exit_verified_price=exit_verified_price,
+            exit_data_quality=exit_data_quality,
+            duration_seconds=signal.duration_seconds,
+        )
         logger.info(
-            f"Sinyal kapatıldı: {signal.signal_id} | {signal.result} | "
-            f"P&L: ${pnl:.2f} ({pnl_pct:.2f}%) | Süre: {signal.duration_seconds}s"
+            "Sinyal kapatıldı: %s | %s | P&L: $%.2f (%.2f%%) | Süre: %ss",
+            signal.signal_id, signal.result, pnl, pnl_pct, signal.duration_seconds,
         )
         return signal
 
     def reject_signal(self, signal_id: str, reason: str):
         """Sinyali reddet (risk yönetimi veya veri kalitesi sorunu)."""
-        for s in self.signals:
-            if s.signal_id == signal_id:
-                s.status = "REJECTED"
-                s.exit_reason = reason
-                self._save_history()
-                logger.info(f"Sinyal reddedildi: {signal_id} | {reason}")
-                return
+        s = self._by_id.get(signal_id)
+        if s is None:
+            return
+        self._set_status(s, "REJECTED")
+        s.exit_reason = reason
+        self._append_update(signal_id, status=s.status, exit_reason=reason)
+        logger.info("Sinyal reddedildi: %s | %s", signal_id, reason)
 
     def get_statistics(self) -> dict:
-        """Kapsamlı sinyal istatistikleri."""
-        closed = [s for s in self.signals if s.status == "CLOSED"]
-        active = [s for s in self.signals if s.status == "ACTIVE"]
-        rejected = [s for s in self.signals if s.status == "REJECTED"]
-        pending = [s for s in self.signals if s.status == "PENDING"]
+        """Kapsamlı sinyal istatistikleri (toplamlar mutator'larda tutulan sayaçlardan).
 
-        wins = [s for s in closed if s.result == "WIN"]
-        losses = [s for s in closed if s.result == "LOSS"]
+        Sonuç önbelleklenir; değişiklik yoksa aynı (salt okunur kabul edilen) dict döner.
+        """
+        # ISO zaman damgaları UTC ve "YYYY-MM-DD" ile başlar: ayrıştırmadan önek karşılaştır
+        today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if (not self._stats_dirty and self._stats_cache is not None
+                and self._stats_day == today_str):
+            return self._stats_cache
+
+        c = self._counters
+        status_counts = self._status_counts
+        n_closed = status_counts.get("CLOSED", 0)
+        n_signals = self._n_rows  # arşivdekiler dahil
+        n_wins, n_losses = c["wins"], c["losses"]
+        win_rate = (n_wins / n_closed * 100) if n_closed else 0
+        avg_win = (c["sum_win_pct"] / n_wins) if n_wins else 0
+        avg_loss = (c["sum_loss_pct"] / n_losses) if n_losses else 0
 
-        total_pnl = sum(s.net_pnl for s in closed)
-        total_fees = sum(s.fee for s in closed)
-        
-        win_rate = (len(wins) / len(closed) * 100) if closed else 0
-        avg_win = (sum(s.pnl_pct for s in wins) / len(wins)) if wins else 0
-        avg_loss = (sum(s.pnl_pct for s in losses) / len(losses)) if losses else 0
-        
         # Profit factor
-        gross_profit = sum(s.net_pnl for s in wins) if wins else 0
-        gross_loss = abs(sum(s.net_pnl for s in losses)) if losses else 1
+        gross_profit = c["gross_profit"]
+        gross_loss = abs(c["loss_net_sum"]) if n_losses else 1
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
 
         # Ortalama trade süresi
-        avg_duration = 0
-        if closed:
-            avg_duration = sum(s.duration_seconds for s in closed) / len(closed)
-
-        # Veri kalitesi istatistikleri
-        good_quality = len([s for s in self.signals if s.data_quality == "GOOD"])
-        warning_quality = len([s for s in self.signals if s.data_quality == "WARNING"])
-        fail_quality = len([s for s in self.signals if s.data_quality == "FAIL"])
-
-        # Ardışık kazanç/kayıp
-        max_consecutive_wins = 0
-        max_consecutive_losses = 0
-        current_streak = 0
-        streak_type = None
-        for s in closed:
-            if s.result == streak_type:
-                current_streak += 1
-            else:
-                streak_type = s.result
-                current_streak = 1
-            if streak_type == "WIN":
-                max_consecutive_wins = max(max_consecutive_wins, current_streak)
-            elif streak_type == "LOSS":
-                max_consecutive_losses = max(max_consecutive_losses, current_streak)
-
-        # Sinyal dağılımı (BUY vs SELL)
-        buy_signals = len([s for s in self.signals if s.direction == "BUY"])
-        sell_signals = len([s for s in self.signals if s.direction == "SELL"])
-        buy_wins = len([s for s in wins if s.direction == "BUY"])
-        sell_wins = len([s for s in wins if s.direction == "SELL"])
-
-        # En iyi ve en kötü trade
-        best_trade = max(closed, key=lambda s: s.pnl_pct) if closed else None
-        worst_trade = min(closed, key=lambda s: s.pnl_pct) if closed else None
-
-        # Bugünkü istatistikler
-        today = datetime.now(timezone.utc).date()
-        today_signals = [s for s in self.signals 
-                        if datetime.fromisoformat(s.signal_time).date() == today]
-        today_closed = [s for s in closed
-                       if s.exit_time and datetime.fromisoformat(s.exit_time).date() == today]
-        today_pnl = sum(s.net_pnl for s in today_closed)
+        avg_duration = (c["sum_duration"] / n_closed) if n_closed else 0
+
+        # Sıra bağımlı metrikler (kayıt sırasıyla) — sütunlar üzerinde vektörel
+        n = self._n_rows
+        (max_consecutive_wins, max_consecutive_losses,
+         best_row, worst_row) = _order_stats(self._col_result[:n], self._col_pnl_pct[:n])
+
+        buy_signals, sell_signals = c["buy_signals"], c["sell_signals"]
+        good_quality = c["GOOD"]
+        today_closed, today_pnl = self._day_closed.get(today_str, (0, 0))
 
         stats = {
-            "total_signals": len(self.signals),
-            "active": len(active),
-            "closed": len(closed),
-            "rejected": len(rejected),
-            "pending": len(pending),
-            "wins": len(wins),
-            "losses": len(losses),
+            "total_signals": n_signals,
+            "active": status_counts.get("ACTIVE", 0),
+            "closed": n_closed,
+            "rejected": status_counts.get("REJECTED", 0),
+            "pending": status_counts.get("PENDING", 0),
+            "wins": n_wins,
+            "losses": n_losses,
             "win_rate": win_rate,
-            "total_pnl": total_pnl,
-            "total_fees": total_fees,
+            "total_pnl": c["total_pnl"],
+            "total_fees": c["total_fees"],
             "avg_win_pct": avg_win,
             "avg_loss_pct": avg_loss,
             "profit_factor": profit_factor,
@@ -335,35 +844,34 @@ class SignalTracker:
             "max_consecutive_losses": max_consecutive_losses,
             "buy_signals": buy_signals,
             "sell_signals": sell_signals,
-            "buy_win_rate": (buy_wins / buy_signals * 100) if buy_signals > 0 else 0,
-            "sell_win_rate": (sell_wins / sell_signals * 100) if sell_signals > 0 else 0,
-            "best_trade": best_trade.to_dict() if best_trade else None,
-            "worst_trade": worst_trade.to_dict() if worst_trade else None,
+            "buy_win_rate": (c["buy_wins"] / buy_signals * 100) if buy_signals > 0 else 0,
+            "sell_win_rate": (c["sell_wins"] / sell_signals * 100) if sell_signals > 0 else 0,
+            "best_trade": self._row_dict(best_row),
+            "worst_trade": self._row_dict(worst_row),
             "data_quality": {
                 "good": good_quality,
-                "warning": warning_quality,
-                "fail": fail_quality,
-                "good_pct": (good_quality / len(self.signals) * 100) if self.signals else 0,
+                "warning": c["WARNING"],
+                "fail": c["FAIL"],
+                "good_pct": (good_quality / n_signals * 100) if n_signals else 0,
             },
             "today": {
-                "signals": len(today_signals),
-                "closed": len(today_closed),
+                "signals": self._day_signals.get(today_str, 0),
+                "closed": today_closed,
                 "pnl": today_pnl,
             },
         }
 
-        # İstatistikleri kaydet
-        try:
-            os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
-            with open(STATS_FILE, "w", encoding="utf-8") as f:
-                json.dump(stats, f, ensure_ascii=False, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"İstatistik kaydetme hatası: {e}")
-
+        self._stats_cache = stats
+        self._stats_day = today_str
+        self._stats_dirty = False
         return stats
 
     def get_recent_signals(self, count: int = 10) -> list[SignalRecord]:
-        """Son N sinyali getir."""
+        """Son N sinyali getir (eskiden yeniye)."""
+        if 0 < count <= RECENT_MAXLEN:
+            recent = list(islice(reversed(self._recent), count))
+            recent.reverse()
+            return recent
         return self.signals[-count:] if self.signals else []
 
     def get_active_count(self) -> int:
@@ -11,14 +11,347 @@ Kavramlar:
 - LVN (Low Volume Node): Hızlı geçiş noktası → fiyat hızla geçer
 """
 
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
 from utils.logger import setup_logger
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = setup_logger("VPVR")
 
 
-def calculate_vpvr(df: pd.DataFrame, num_bins: int = 50, value_area_pct: float = 0.70) -> dict:
+class VPVRResult(NamedTuple):
+    """calculate_vpvr sonucu."""
+    poc: float
+    vah: float
+    val: float
+    hvn_levels: list
+    lvn_levels: list
+    current_zone: str
+    nearest_hvn: float | None
+    poc_distance_pct: float
+    total_bins: int
+    signal: str
+    score_boost: int
+    price_range_high: float
+    price_range_low: float
+    available: bool
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+# Sonuç önbelleği: (id(df), uzunluk, son index, uç değerler, parametreler) → sonuç
+_VPVR_CACHE_MAX = 256
+_vpvr_cache: dict[tuple, VPVRResult] = {}
+
+# NumPy yolunda bu bant genişliğinin üstünde tek bin'lik mumlar ayrı işlenir
+_SINGLE_BIN_SPLIT_BAND = 8
+
+# Kayan pencere durumu:
+# sembol → (index, h, l, c, v, alt, üst, bin sayısı, bin_volumes, güncelleme, bins)
+_ROLLING_REBUILD_EVERY = 64
+_rolling_state: dict[str, tuple] = {}
+
+
+if NUMBA_AVAILABLE:
+    @njit("void(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])", cache=True)
+    def _accumulate_volume(highs, lows, closes, volumes, bins, bin_volumes):
+        """Mum hacimlerini bin'lere örtüşme oranıyla dağıt (bin_volumes yerinde).
+
+        Mum başına yalnızca örtüşebilecek bin aralığı gezilir (genelde 1-3 bin);
+        doji hacmi close'un bin'ine gider. Toplama sırası mum sırasıdır.
+        """
+        num_bins = bin_volumes.size
+        lo = bins[0]
+        bin_width = (bins[num_bins] - lo) / num_bins
+        for i in range(highs.size):
+            h = highs[i]
+            l = lows[i]
+            v = volumes[i]
+            candle_range = h - l
+            if candle_range <= 0:
+                # Eşit aralıklı bin: doğrudan indeks + kenar düzeltmesi (digitize ile aynı)
+                c = closes[i]
+                j = min(max(int((c - lo) / bin_width), 0), num_bins - 1)
+                if c >= bins[j + 1]:
+                    j += 1
+                elif c < bins[j]:
+                    j -= 1
+                bin_volumes[min(max(j, 0), num_bins - 1)] += v
+                continue
+            # Kayan nokta payı için aralık bir bin genişletilir; örtüşmeyen bin atlanır
+            j_start = max(int((l - lo) / bin_width) - 1, 0)
+            j_end = min(int((h - lo) / bin_width) + 2, num_bins)
+            for j in range(j_start, j_end):
+                overlap_low = max(bins[j], l)
+                overlap_high = min(bins[j + 1], h)
+                if overlap_high > overlap_low:
+                    bin_volumes[j] += v * ((overlap_high - overlap_low) / candle_range)
+else:
+    def _accumulate_volume(highs, lows, closes, volumes, bins, bin_volumes):
+        """Mum hacimlerini bin'lere dağıt — NumPy.
+
+        Tam (mum × bin) matrisi yerine yalnızca mumun örtüşebileceği bin bandı:
+        (mum × K), K = en geniş mumun kapsadığı bin sayısı (+ kayan nokta payı).
+        K büyükse tek bin'e sığan mumlar banda girmez. bincount girdi sırasıyla
+        toplar: döngüdeki toplama sırasıyla aynı.
+        """
+        if not highs.size:
+            return
+        num_bins = bin_volumes.size
+        lo = bins[0]
+        bin_width = (bins[num_bins] - lo) / num_bins
+        candle_range = highs - lows
+        j_start = np.clip(((lows - lo) / bin_width).astype(np.intp) - 1, 0, num_bins - 1)
+        j_end = np.clip(((highs - lo) / bin_width).astype(np.intp) + 2, 1, num_bins)
+        band = int((j_end - j_start).max())
+        single = None
+        if band > _SINGLE_BIN_SPLIT_BAND:
+            # Birkaç geniş mum bandı büyütüyorsa tek bin'e sığan mumlar ayrılır:
+            # örtüşme oranı tam 1, hacmin tamamı low'un bin'ine gider
+            single_bin = np.clip(((lows - lo) / bin_width).astype(np.intp), 0, num_bins - 1)
+            single_bin += lows >= bins[single_bin + 1]
+            np.minimum(single_bin, num_bins - 1, out=single_bin)
+            single_bin -= lows < bins[single_bin]
+            np.maximum(single_bin, 0, out=single_bin)
+            single = ((candle_range > 0) & (bins[single_bin] <= lows)
+                      & (highs <= bins[single_bin + 1]))
+            single_volumes = np.where(single, volumes, 0.0)
+            rows = np.flatnonzero(~single)
+            highs, lows, closes, volumes = highs[rows], lows[rows], closes[rows], volumes[rows]
+            candle_range, j_start, j_end = candle_range[rows], j_start[rows], j_end[rows]
+        cols = j_start[:, None] + np.arange(band)
+        in_band = cols < j_end[:, None]
+        np.minimum(cols, num_bins - 1, out=cols)
+        overlap_low = np.maximum(bins[cols], lows[:, None])
+        overlap_high = np.minimum(bins[cols + 1], highs[:, None])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contrib = np.where(
+                in_band & (overlap_high > overlap_low),
+                volumes[:, None] * ((overlap_high - overlap_low) / candle_range[:, None]),
+                0.0,
+            )
+        doji_rows = np.flatnonzero(candle_range <= 0)
+        if doji_rows.size:
+            # Doji: hacmi close bin'ine ver. Bin'ler eşit aralıklı: digitize (ikili arama)
+            # yerine doğrudan indeks; kenardaki close için tek adımlık düzeltme
+            doji_close = closes[doji_rows]
+            doji_bins = np.clip(((doji_close - lo) / bin_width).astype(np.intp), 0, num_bins - 1)
+            doji_bins += doji_close >= bins[doji_bins + 1]
+            doji_bins -= doji_close < bins[doji_bins]
+            np.clip(doji_bins, 0, num_bins - 1, out=doji_bins)
+            contrib[doji_rows] = 0.0
+            contrib[doji_rows, 0] = volumes[doji_rows]
+            cols[doji_rows, 0] = doji_bins
+        if single is not None:
+            # Mum sırası (toplama sırası) korunur: tek bin'liler ilk sütunda tek girdi
+            all_cols = np.zeros((single.size, band), dtype=np.intp)
+            all_contrib = np.zeros((single.size, band))
+            all_cols[:, 0] = single_bin
+            all_contrib[:, 0] = single_volumes
+            all_cols[rows] = cols
+            all_contrib[rows] = contrib
+            cols, contrib = all_cols, all_contrib
+        bin_volumes += np.bincount(cols.ravel(), weights=contrib.ravel(), minlength=num_bins)
+
+
+if NUMBA_AVAILABLE:
+    @njit("UniTuple(i8, 2)(f8[:], i8, f8)", cache=True)
+    def _value_area(bin_volumes, poc_idx, target_volume):
+        """Value Area sınırları (alt, üst bin): POC'tan hacmi büyük komşuya doğru genişle.
+
+        Biten tarafın komşusu -inf sayılır: hiç seçilmez, genişleme diğer
+        taraftan sürer.
+        """
+        num_bins = bin_volumes.size
+        va_volume = bin_volumes[poc_idx]
+        va_low_idx = poc_idx
+        va_high_idx = poc_idx
+        while va_volume < target_volume and (va_low_idx > 0 or va_high_idx < num_bins - 1):
+            expand_up = bin_volumes[va_high_idx + 1] if va_high_idx < num_bins - 1 else -np.inf
+            expand_down = bin_volumes[va_low_idx - 1] if va_low_idx > 0 else -np.inf
+            if expand_up >= expand_down:
+                va_high_idx += 1
+                va_volume += expand_up
+            else:
+                va_low_idx -= 1
+                va_volume += expand_down
+        return va_low_idx, va_high_idx
+else:
+    def _value_area(bin_volumes, poc_idx, target_volume):
+        """Value Area sınırları (alt, üst bin): POC'tan hacmi büyük komşuya doğru genişle."""
+        num_bins = bin_volumes.size
+        # Uçlarda -inf: biten taraf seçilmez (üst uçta alt komşu 0 hacimliyse döngü takılmasın)
+        padded = [-np.inf, *bin_volumes.tolist(), -np.inf]
+        va_volume = padded[poc_idx + 1]
+        lo = poc_idx + 1  # padded indeksleri
+        hi = poc_idx + 1
+        while va_volume < target_volume and (lo > 1 or hi < num_bins):
+            expand_up = padded[hi + 1]
+            expand_down = padded[lo - 1]
+            if expand_up >= expand_down:
+                hi += 1
+                va_volume += expand_up
+            else:
+                lo -= 1
+                va_volume += expand_down
+        return lo - 1, hi - 1
+
+
+def _rolling_bin_volumes(symbol, index, highs, lows, closes, volumes, num_bins):
+    """Sembolün bin hacimlerini önceki pencereden artımlı güncelle.
+
+    Düşen/değişen mumlar (eski hâli) çıkarılır, yeni/değişen mumlar eklenir.
+    Çıkarılan mumlar fiyat ucu değilse aralık yalnızca eklenen mumlarla
+    güncellenir (O(k)). Aralık (dolayısıyla bin'ler) değiştiyse veya her
+    _ROLLING_REBUILD_EVERY güncellemede bir (kayma birikmesin diye) baştan
+    hesaplanır.
+
+    Returns:
+        (bin_volumes, bins, alt, üst) ya da fiyat aralığı boşsa None
+    """
+    state = _rolling_state.get(symbol)
+    sub = add = None
+    if state is not None and state[9] < _ROLLING_REBUILD_EVERY and state[7] == num_bins:
+        old_index, oh, ol, oc, ov = state[:5]
+        # Zaman index'i sıralı: ikili arama; değilse doğrusal arama
+        k = int(old_index.searchsorted(index[0]))
+        if k >= old_index.size or old_index[k] != index[0]:
+            start = np.flatnonzero(old_index == index[0])
+            k = int(start[0]) if start.size else -1
+        m = old_index.size - k  # örtüşen mum sayısı
+        if k >= 0 and m <= index.size and np.array_equal(old_index[k:], index[:m]):
+            changed = np.flatnonzero(
+                (oh[k:] != highs[:m]) | (ol[k:] != lows[:m])
+                | (oc[k:] != closes[:m]) | (ov[k:] != volumes[:m])
+            )
+            sub = np.arange(k)
+            add = np.arange(m, index.size)
+            if changed.size:
+                sub = np.concatenate((sub, k + changed))
+                add = np.concatenate((changed, add))
+            if sub.size + add.size >= index.size:
+                sub = add = None
+    
+    if sub is not None and (not sub.size or (state[1][sub].max() < state[6]
+                                             and state[2][sub].min() > state[5])):
+        # Uçlar pencerede kaldı: aralık yalnızca eklenen mumlarla genişleyebilir
+        price_range_low, price_range_high = state[5], state[6]
+        if add.size:
+            price_range_high = float(np.maximum(price_range_high, highs[add].max()))
+            price_range_low = float(np.minimum(price_range_low, lows[add].min()))
+    else:
+        price_range_high = float(np.max(highs))
+        price_range_low = float(np.min(lows))
+    if price_range_high <= price_range_low:
+        _rolling_state.pop(symbol, None)
+        return None
+    
+    if sub is not None and price_range_low == state[5] and price_range_high == state[6]:
+        bins = state[10]
+        removed = np.zeros(num_bins)
+        _accumulate_volume(state[1][sub], state[2][sub], state[3][sub], state[4][sub],
+                           bins, removed)
+        bin_volumes = state[8].copy()
+        bin_volumes -= removed
+        _accumulate_volume(highs[add], lows[add], closes[add], volumes[add], bins, bin_volumes)
+        # Çıkarma artığı: boş kalması gereken bin'ler sıfırlanır (LVN > 0 koşulu)
+        bin_volumes[bin_volumes <= bin_volumes.sum() * 1e-12] = 0.0
+        updates = state[9] + 1
+    else:
+        bins = np.linspace(price_range_low, price_range_high, num_bins + 1)
+        bin_volumes = np.zeros(num_bins)
+        _accumulate_volume(highs, lows, closes, volumes, bins, bin_volumes)
+        updates = 0
+    _rolling_state[symbol] = (
+        index.copy(), highs.copy(), lows.copy(), closes.copy(), volumes.copy(),
+        price_range_low, price_range_high, num_bins, bin_volumes, updates, bins,
+    )
+    return bin_volumes, bins, price_range_low, price_range_high
+
+
+def _profile_result(bin_volumes: np.ndarray, bins: np.ndarray, current_price: float,
+                    price_range_low: float, price_range_high: float,
+                    value_area_pct: float) -> VPVRResult:
+    """Bin hacimlerinden POC / Value Area / HVN-LVN ve fiyat konumu."""
+    num_bins = bin_volumes.size
+    bin_centers = (bins[:-1] + bins[1:]) / 2
+    
+    # POC: En yüksek hacimli seviye
+    poc_idx = int(np.argmax(bin_volumes))
+    poc = float(bin_centers[poc_idx])
+    
+    # Value Area (%70 hacim)
+    total_volume = float(np.sum(bin_volumes))
+    target_volume = total_volume * value_area_pct
+    
+    # POC'tan dışa doğru genişlet
+    va_low_idx, va_high_idx = _value_area(bin_volumes, poc_idx, target_volume)
+    
+    vah = float(bin_centers[va_high_idx])
+    val = float(bin_centers[va_low_idx])
+    
+    # HVN: Ortalamanın 1.5x üstü hacimli seviyeler
+    avg_vol = total_volume / num_bins  # np.mean ile aynı: ikinci indirgeme yapılmaz
+    hvn_levels = bin_centers[bin_volumes > avg_vol * 1.5]
+    
+    # LVN: Ortalamanın 0.4x altı hacimli seviyeler
+    lvn_levels = bin_centers[(bin_volumes < avg_vol * 0.4) & (bin_volumes > 0)]
+    
+    # Mevcut fiyata göre konum
+    if current_price > vah:
+        current_zone = "ABOVE_VALUE_AREA"
+        signal = "NEUTRAL"  # Aşırı satın alınmış
+        score_boost = -3
+    elif current_price < val:
+        current_zone = "BELOW_VALUE_AREA"
+        signal = "NEUTRAL"
+        score_boost = +3
+    elif abs(current_price - poc) / poc < 0.002:
+        current_zone = "AT_POC"
+        signal = "SUPPORT"  # POC güçlü destek/direnç
+        score_boost = +2
+    else:
+        current_zone = "INSIDE_VALUE_AREA"
+        signal = "NEUTRAL"
+        score_boost = 0
+    
+    # En yakın HVN seviyesi
+    nearest_hvn = None
+    if hvn_levels.size:
+        nearest_hvn = float(hvn_levels[np.argmin(np.abs(hvn_levels - current_price))])
+    
+    # POC'a yakınlık ek sinyal
+    poc_distance_pct = abs(current_price - poc) / current_price * 100
+    
+    return VPVRResult(
+        poc=round(poc, 6),
+        vah=round(vah, 6),
+        val=round(val, 6),
+        # bin_centers artan sırada: maske sırayı korur, ayrıca sıralama gerekmez
+        hvn_levels=[round(p, 6) for p in hvn_levels[-5:].tolist()],
+        lvn_levels=[round(p, 6) for p in lvn_levels[-5:].tolist()],
+        current_zone=current_zone,
+        nearest_hvn=round(nearest_hvn, 6) if nearest_hvn else None,
+        poc_distance_pct=round(poc_distance_pct, 3),
+        total_bins=num_bins,
+        signal=signal,
+        score_boost=score_boost,
+        price_range_high=round(price_range_high, 6),
+        price_range_low=round(price_range_low, 6),
+        available=True,
+    )
+
+
+def calculate_vpvr(df: pd.DataFrame, num_bins: int = 50, value_area_pct: float = 0.70,
+                   symbol: str | None = None) -> VPVRResult:
     """
     Volume Profile hesapla.
     
@@ -26,146 +359,62 @@ def calculate_vpvr(df: pd.DataFrame, num_bins: int = 50, value_area_pct: float =
         df: OHLCV DataFrame (high, low, close, volume gerekli)
         num_bins: Fiyat seviyesi sayısı
         value_area_pct: Value Area yüzdesi (default %70)
+        symbol: Verilirse bin hacimleri sembolün önceki penceresinden artımlı güncellenir
     
     Returns:
-        dict: poc, vah, val, hvn_levels, lvn_levels, current_zone, signal, score_boost
+        VPVRResult: poc, vah, val, hvn_levels, lvn_levels, current_zone, signal, score_boost
+
+    Aynı DataFrame ile tekrar çağrılırsa önbellekteki sonuç döner;
+    seviye listeleri salt okunur kabul edilmelidir.
     """
     if df is None or len(df) < 20:
         return _empty_vpvr()
     
     try:
-        highs = df["high"].values.astype(float)
-        lows = df["low"].values.astype(float)
-        volumes = df["volume"].values.astype(float)
-        closes = df["close"].values.astype(float)
-        
-        price_range_high = float(np.max(highs))
-        price_range_low = float(np.min(lows))
+        # float64 sütunlar kopyalanmadan görünüm olarak alınır (yalnızca okunur)
+        highs = df["high"].to_numpy(dtype=np.float64, copy=False)
+        lows = df["low"].to_numpy(dtype=np.float64, copy=False)
+        volumes = df["volume"].to_numpy(dtype=np.float64, copy=False)
+        closes = df["close"].to_numpy(dtype=np.float64, copy=False)
         
-        if price_range_high <= price_range_low:
-            return _empty_vpvr()
-        
-        # Fiyat bin'leri oluştur
-        bins = np.linspace(price_range_low, price_range_high, num_bins + 1)
-        bin_centers = (bins[:-1] + bins[1:]) / 2
-        bin_volumes = np.zeros(num_bins)
+        key = (id(df), closes.size, df.index[-1], closes[0], closes[-1], highs[-1],
+               lows[-1], volumes[-1], num_bins, value_area_pct)
+        hit = _vpvr_cache.get(key)
+        if hit is not None:
+            return hit
         
         # Her mum'un hacmini kapsadığı fiyat seviyelerine dağıt
-        for i in range(len(df)):
-            h, l, v = highs[i], lows[i], volumes[i]
-            candle_range = h - l
-            
-            if candle_range <= 0:
-                # Doji: hacmi close bin'ine ver
-                bin_idx = np.digitize(closes[i], bins) - 1
-                bin_idx = max(0, min(bin_idx, num_bins - 1))
-                bin_volumes[bin_idx] += v
-                continue
+        if symbol is not None:
+            rolled = _rolling_bin_volumes(symbol, df.index.to_numpy(), highs, lows,
+                                          closes, volumes, num_bins)
+            if rolled is None:
+                return _empty_vpvr()
+            bin_volumes, bins, price_range_low, price_range_high = rolled
+        else:
+            price_range_high = float(np.max(highs))
+            price_range_low = float(np.min(lows))
             
-            # Hacmi fiyat aralığına orantısal dağıt
-            for j in range(num_bins):
-                bin_low = bins[j]
-                bin_high = bins[j + 1]
-                
-                overlap_low = max(bin_low, l)
-                overlap_high = min(bin_high, h)
-                
-                if overlap_high > overlap_low:
-                    overlap_pct = (overlap_high - overlap_low) / candle_range
-                    bin_volumes[j] += v * overlap_pct
-        
-        # POC: En yüksek hacimli seviye
-        poc_idx = int(np.argmax(bin_volumes))
-        poc = float(bin_centers[poc_idx])
-        
-        # Value Area (%70 hacim)
-        total_volume = float(np.sum(bin_volumes))
-        target_volume = total_volume * value_area_pct
-        
-        # POC'tan dışa doğru genişlet
-        va_volume = bin_volumes[poc_idx]
-        va_low_idx = poc_idx
-        va_high_idx = poc_idx
-        
-        while va_volume < target_volume and (va_low_idx > 0 or va_high_idx < num_bins - 1):
-            expand_up = bin_volumes[va_high_idx + 1] if va_high_idx < num_bins - 1 else 0
-            expand_down = bin_volumes[va_low_idx - 1] if va_low_idx > 0 else 0
+            if price_range_high <= price_range_low:
+                return _empty_vpvr()
             
-            if expand_up >= expand_down:
-                va_high_idx = min(va_high_idx + 1, num_bins - 1)
-                va_volume += expand_up
-            else:
-                va_low_idx = max(va_low_idx - 1, 0)
-                va_volume += expand_down
-        
-        vah = float(bin_centers[va_high_idx])
-        val = float(bin_centers[va_low_idx])
-        
-        # HVN: Ortalamanın 1.5x üstü hacimli seviyeler
-        avg_vol = float(np.mean(bin_volumes))
-        hvn_levels = [
-            float(bin_centers[i]) for i in range(num_bins)
-            if bin_volumes[i] > avg_vol * 1.5
-        ]
-        
-        # LVN: Ortalamanın 0.4x altı hacimli seviyeler
-        lvn_levels = [
-            float(bin_centers[i]) for i in range(num_bins)
-            if bin_volumes[i] < avg_vol * 0.4 and bin_volumes[i] > 0
-        ]
-        
-        # Mevcut fiyata göre konum
-        current_price = float(closes[-1])
-        
-        if current_price > vah:
-            current_zone = "ABOVE_VALUE_AREA"
-            signal = "NEUTRAL"  # Aşırı satın alınmış
-            score_boost = -3
-        elif current_price < val:
-            current_zone = "BELOW_VALUE_AREA"
-            signal = "NEUTRAL"
-            score_boost = +3
-        elif abs(current_price - poc) / poc < 0.002:
-            current_zone = "AT_POC"
-            signal = "SUPPORT"  # POC güçlü destek/direnç
-            score_boost = +2
-        else:
-            current_zone = "INSIDE_VALUE_AREA"
-            signal = "NEUTRAL"
-            score_boost = 0
-        
-        # En yakın HVN seviyesi
-        nearest_hvn = None
-        if hvn_levels:
-            distances = [abs(p - current_price) for p in hvn_levels]
-            nearest_hvn = hvn_levels[int(np.argmin(distances))]
-        
-        # POC'a yakınlık ek sinyal
-        poc_distance_pct = abs(current_price - poc) / current_price * 100
+            # Fiyat bin'leri oluştur
+            bins = np.linspace(price_range_low, price_range_high, num_bins + 1)
+            bin_volumes = np.zeros(num_bins)
+            _accumulate_volume(highs, lows, closes, volumes, bins, bin_volumes)
         
-        return {
-            "poc": round(poc, 6),
-            "vah": round(vah, 6),
-            "val": round(val, 6),
-            "hvn_levels": [round(p, 6) for p in sorted(hvn_levels)[-5:]],
-            "lvn_levels": [round(p, 6) for p in sorted(lvn_levels)[-5:]],
-            "current_zone": current_zone,
-            "nearest_hvn": round(nearest_hvn, 6) if nearest_hvn else None,
-            "poc_distance_pct": round(poc_distance_pct, 3),
-            "total_bins": num_bins,
-            "signal": signal,
-            "score_boost": score_boost,
-            "price_range_high": round(price_range_high, 6),
-            "price_range_low": round(price_range_low, 6),
-            "available": True,
-        }
+        result = _profile_result(bin_volumes, bins, float(closes[-1]),
+                                 price_range_low, price_range_high, value_area_pct)
+        if len(_vpvr_cache) >= _VPVR_CACHE_MAX:
+            del _vpvr_cache[next(iter(_vpvr_cache))]
+        _vpvr_cache[key] = result
+        return result
     
     except Exception as e:
         logger.error(f"VPVR hesaplama hatası: {e}")
         return _empty_vpvr()
 
 
-def get_vpvr_score_boost(vpvr_data: dict, signal_side: str, current_price: float) -> float:
+def get_vpvr_score_boost(vpvr_data: VPVRResult, signal_side: str, current_price: float) -> float:
     """
     VPVR verilerine göre skor katkısı.
     
@@ -173,12 +422,10 @@ def get_vpvr_score_boost(vpvr_data: dict, signal_side: str, current_price: float
     - VAH üstünde buy → -score (aşırı satın alınmış)
     - LVN üstünde price → hızlı hareket → +score
     """
-    if not vpvr_data.get("available", False):
+    if not vpvr_data.available:
         return 0.0
     
-    zona = vpvr_data.get("current_zone", "INSIDE_VALUE_AREA")
-    poc = vpvr_data.get("poc", 0)
-    poc_dist = vpvr_data.get("poc_distance_pct", 100)
+    zona = vpvr_data.current_zone
     
     boost = 0.0
     
@@ -191,7 +438,7 @@ def get_vpvr_score_boost(vpvr_data: dict, signal_side: str, current_price: float
             boost = -3  # Pahalı bölge
         
         # LVN üstünde fiyat → yukarıya kolay hareket
-        for lvn in vpvr_data.get("lvn_levels", []):
+        for lvn in vpvr_data.lvn_levels:
             if abs(current_price - lvn) / current_price < 0.01:
                 boost += 2
                 break
@@ -207,13 +454,13 @@ def get_vpvr_score_boost(vpvr_data: dict, signal_side: str, current_price: float
     return float(max(-6.0, min(6.0, boost)))
 
 
-def _empty_vpvr() -> dict:
-    return {
-        "poc": 0, "vah": 0, "val": 0,
-        "hvn_levels": [], "lvn_levels": [],
-        "current_zone": "UNKNOWN", "nearest_hvn": None,
-        "poc_distance_pct": 100, "total_bins": 0,
-        "signal": "NEUTRAL", "score_boost": 0,
-        "price_range_high": 0, "price_range_low": 0,
-        "available": False,
-    }
+def _empty_vpvr() -> VPVRResult:
+    return VPVRResult(
+        poc=0, vah=0, val=0,
+        hvn_levels=[], lvn_levels=[],
+        current_zone="UNKNOWN", nearest_hvn=None,
+        poc_distance_pct=100, total_bins=0,
+        signal="NEUTRAL", score_boost=0,
+        price_range_high=0, price_range_low=0,
+        available=False,
+    )